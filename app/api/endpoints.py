@@ -1,68 +1,136 @@
 """FastAPI endpoints for the Notion Context Service."""
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import asyncio
+import io
 import logging
+import orjson
 
 from ..models.schema import (
     SearchQuery, SearchResponse, ContextRequest, ContextResponse, 
     HealthResponse, NotionPage, QueryResponse
 )
-from ..notion.client import NotionClient, create_notion_client
+from ..notion.cache import cache_response
+from ..notion.client import NotionClient, create_notion_client, close_notion_client as close_shared_client
 from ..notion.searcher import NotionSearcher
 from ..notion.fetcher import NotionFetcher
-from ..notion.parser import NotionParser
-from ..config import settings
+from ..notion.parser import default_parser
+from ..config import VERSION
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter()
 
+# Stateless parser shared by every request
+_PARSER = default_parser
+
 # Global instances (in production, use dependency injection)
-_notion_client = None
 _searcher = None
 _fetcher = None
 
-def get_notion_client() -> NotionClient:
-    """Get or create Notion client instance using the helper function."""
-    global _notion_client
-    if _notion_client is None:
-        try:
-            _notion_client = create_notion_client()
-        except ValueError as e:
-            raise HTTPException(
-                status_code=500, 
-                detail=str(e)
-            )
-    return _notion_client
-
-def get_searcher() -> NotionSearcher:
+# Number of page exports the export stream keeps in flight. Notion calls
+# themselves are bounded by NotionClient, so this only caps buffered records.
+_PAGE_FETCH_CONCURRENCY = 5
+
+# Seconds whole GET responses are reused (server-side with Redis, and by
+# clients via a private Cache-Control)
+_RESPONSE_CACHE_SECONDS = 30
+
+# Sent with partial results (some entries carry an "error") so neither the
+# response cache nor clients keep them
+_NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+# Detail returned with 503s when Notion cannot be reached. Only the string is
+# shared: an HTTPException instance carries per-raise traceback state.
+_CONN_ERR_DETAIL = "Notion API connection failed"
+
+# Per-page templates for the markdown and text context formats
+_MD_TMPL = (
+    "# {title}\n**URL:** {url}\n**Created:** {created}\n**Last Edited:** {edited}\n\n{content}"
+    "\n---\n"
+)
+_TEXT_TMPL = (
+    "Page: {title}\nURL: {url}\nCreated: {created}\nLast Edited: {edited}\n\n{content}"
+    "\n\n" + "=" * 50 + "\n\n"
+)
+
+def _model_response(model: BaseModel) -> Response:
+    """Serialize a response model straight to JSON with pydantic-core.
+    
+    Models built by the service are already valid, so this skips FastAPI's
+    response_model re-validation and dict round trip; the declared
+    response_model still documents the schema.
+    
+    Args:
+        model: Response model instance
+        
+    Returns:
+        JSON response with the model's serialized body
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+def _has_errors(results: List[Dict[str, Any]], nested: str) -> bool:
+    """Check whether any result, or any entry in its ``nested`` list, failed.
+    
+    Args:
+        results: Result entries of a search endpoint
+        nested: Key of the per-result list of pages or items
+        
+    Returns:
+        True if an entry carries an "error"
+    """
+    return any(
+        "error" in r or any("error" in child for child in r.get(nested, ()))
+        for r in results
+    )
+
+async def get_notion_client() -> NotionClient:
+    """Get the shared Notion client instance using the helper function."""
+    try:
+        return await create_notion_client()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=str(e)
+        )
+
+async def get_searcher() -> NotionSearcher:
     """Get or create searcher instance."""
     global _searcher
     if _searcher is None:
-        client = get_notion_client()
+        client = await get_notion_client()
         _searcher = NotionSearcher(client)
     return _searcher
 
-def get_fetcher() -> NotionFetcher:
+async def get_fetcher() -> NotionFetcher:
     """Get or create fetcher instance."""
     global _fetcher
     if _fetcher is None:
-        client = get_notion_client()
+        client = await get_notion_client()
         _fetcher = NotionFetcher(client)
     return _fetcher
 
+async def close_notion_client() -> None:
+    """Close the shared Notion client and drop the cached instances."""
+    global _searcher, _fetcher
+    _searcher = None
+    _fetcher = None
+    await close_shared_client()
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    from datetime import datetime
-    
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.now(),
-        version=settings.version
-    )
+    # Trusted, fixed-shape payload: skip response_model validation
+    return ORJSONResponse({
+        "status": "healthy",
+        "timestamp": datetime.now(),
+        "version": VERSION
+    })
 
 @router.post("/search", response_model=SearchResponse)
 async def search_pages(
@@ -79,7 +147,7 @@ async def search_pages(
         Search results with matching pages
     """
     try:
-        return await searcher.search_pages(search_query)
+        return _model_response(await searcher.search_pages(search_query))
     except Exception as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -101,19 +169,22 @@ async def search_database_pages(
         Search results with matching pages from the database
     """
     try:
-        return await searcher.search_by_database(database_id, search_query)
+        return _model_response(await searcher.search_by_database(database_id, search_query))
     except Exception as e:
         logger.error(f"Database search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/search/recent", response_model=SearchResponse)
+@cache_response(expire=_RESPONSE_CACHE_SECONDS)
 async def get_recent_pages(
+    request: Request,
     max_results: int = 10,
     searcher: NotionSearcher = Depends(get_searcher)
 ):
     """Get recently edited pages.
     
     Args:
+        request: Incoming request, used to key the response cache
         max_results: Maximum number of pages to return
         searcher: Notion searcher instance
         
@@ -121,13 +192,15 @@ async def get_recent_pages(
         List of recently edited pages
     """
     try:
-        return await searcher.get_recent_pages(max_results)
+        return _model_response(await searcher.get_recent_pages(max_results))
     except Exception as e:
         logger.error(f"Failed to get recent pages: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/pages/{page_id}", response_model=NotionPage)
+@cache_response(expire=_RESPONSE_CACHE_SECONDS)
 async def get_page(
+    request: Request,
     page_id: str,
     include_properties: bool = True,
     fetcher: NotionFetcher = Depends(get_fetcher)
@@ -135,6 +208,7 @@ async def get_page(
     """Get a specific page by ID.
     
     Args:
+        request: Incoming request, used to key the response cache
         page_id: ID of the page to retrieve
         include_properties: Whether to include page properties
         fetcher: Notion fetcher instance
@@ -143,7 +217,7 @@ async def get_page(
         Page data with content
     """
     try:
-        return await fetcher.fetch_page(page_id, include_properties)
+        return _model_response(await fetcher.fetch_page(page_id, include_properties))
     except Exception as e:
         logger.error(f"Failed to get page {page_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -172,11 +246,11 @@ async def get_context(
         # Format context based on requested format
         context = _format_context(pages, context_request.format)
         
-        return ContextResponse(
+        return _model_response(ContextResponse.model_construct(
             pages=pages,
             context=context,
             total_pages=len(pages)
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Failed to get context: {e}")
@@ -193,35 +267,31 @@ def _format_context(pages: List[NotionPage], format_type: str) -> str:
         Formatted context string
     """
     if format_type == "json":
-        import json
-        return json.dumps([page.dict() for page in pages], indent=2, default=str)
+        # Timestamps keep their str() form ("2024-01-01 00:00:00+00:00")
+        return orjson.dumps(
+            [page.model_dump() for page in pages],
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode()
     
-    elif format_type == "markdown":
-        context_parts = []
-        for page in pages:
-            context_parts.append(f"# {page.title}")
-            context_parts.append(f"**URL:** {page.url}")
-            context_parts.append(f"**Created:** {page.created_time}")
-            context_parts.append(f"**Last Edited:** {page.last_edited_time}")
-            context_parts.append("")
-            context_parts.append(page.content)
-            context_parts.append("---")
-        return "\n".join(context_parts)
-    
-    else:  # text format
-        context_parts = []
-        for page in pages:
-            context_parts.append(f"Page: {page.title}")
-            context_parts.append(f"URL: {page.url}")
-            context_parts.append(f"Created: {page.created_time}")
-            context_parts.append(f"Last Edited: {page.last_edited_time}")
-            context_parts.append("")
-            context_parts.append(page.content)
-            context_parts.append("\n" + "="*50 + "\n")
-        return "\n".join(context_parts)
+    template = _MD_TMPL if format_type == "markdown" else _TEXT_TMPL
+    buf = io.StringIO()
+    write = buf.write
+    for page in pages:
+        write(template.format_map({
+            "title": page.title,
+            "url": page.url,
+            "created": page.created_time,
+            "edited": page.last_edited_time,
+            "content": page.content,
+        }))
+    # Pages are newline-separated, with no newline after the last one
+    return buf.getvalue()[:-1]
 
 @router.get("/query", response_model=QueryResponse)
+@cache_response(expire=_RESPONSE_CACHE_SECONDS, etag=False)
 async def query_notion(
+    request: Request,
     q: str,
     max_results: int = 10,
     per_database_page_limit: int = 10,
@@ -238,31 +308,63 @@ async def query_notion(
     1) Use searcher to find relevant pages/databases (searcher.search_pages_and_databases)
     2) For each database: fetch its pages (fetcher.query_database)
     3) For each page (from search or db): recursively fetch blocks (fetcher.fetch_page_with_blocks)
-    4) Use parser to format content for LLM (parser.flatten_blocks_to_text, parser.blocks_to_elements)
+    4) Use parser to format content for LLM (parser.parse_both, one pass over the blocks)
     5) Return clean structured JSON with the query and results
     """
     try:
         logger.info(f"Processing query: '{q}' with max_results: {max_results}")
         
         # Validate bounds
-        max_results = 50 if max_results > 50 else max_results
-        max_results = 1 if max_results < 1 else max_results
-        per_database_page_limit = 50 if per_database_page_limit > 50 else per_database_page_limit
-        per_database_page_limit = 1 if per_database_page_limit < 1 else per_database_page_limit
-
-        parser = NotionParser()
+        max_results = max(1, min(50, max_results))
+        per_database_page_limit = max(1, min(50, per_database_page_limit))
 
         # Normalize format
         fmt = (format or "both").lower()
         if fmt not in ("text", "elements", "both"):
             fmt = "both"
+        want_text = fmt in ("text", "both")
+        want_elems = fmt in ("elements", "both")
 
         # 1) Search for pages and databases
-        top_matches = searcher.search_pages_and_databases(q, max_results=max_results)
+        top_matches = await searcher.search_pages_and_databases(q, max_results=max_results)
 
-        final_results = []
+        # Every match (and every page of an expanded database) is fetched
+        # concurrently; NotionClient only bounds the leaf Notion calls so that
+        # nested fan-out cannot deadlock on it.
+        async def _expand_page(page):
+            try:
+                # 3) Recursively fetch page blocks
+                content_text = ""
+                elements = []
+                total_blocks = 0
+                if include_blocks:
+                    page_full = await fetcher.fetch_page_with_blocks_cached(page.id, page.last_edited_time)
+                    blocks = page_full.get("blocks", [])
+                    total_blocks = page_full.get("total_blocks", 0)
+                    # 4) Format for LLM per requested format
+                    content_text, elements = _PARSER.parse_both(blocks, want_text, want_elems)
+                expanded = {
+                    "id": page.id,
+                    "title": page.title,
+                    "url": page.url,
+                }
+                if want_text:
+                    expanded["content_text"] = content_text
+                if want_elems:
+                    expanded["elements"] = elements
+                expanded["total_blocks"] = total_blocks
+                return expanded
+            except Exception as e:
+                # Per-page error: continue other pages
+                logger.warning(f"Failed to fetch/parse page {page.id}: {e}")
+                return {
+                    "id": page.id,
+                    "title": page.title,
+                    "url": page.url,
+                    "error": str(e)
+                }
 
-        for match in top_matches:
+        async def _process_match(match):
             obj_type = match.get("object_type")
             try:
                 if obj_type == "database":
@@ -270,62 +372,31 @@ async def query_notion(
                     db_id = match.get("id")
                     db_title = match.get("title")
                     if not expand_databases:
-                        final_results.append({
+                        return {
                             "object_type": "database",
                             "id": db_id,
                             "title": db_title,
                             "url": match.get("url"),
                             "last_edited": match.get("last_edited"),
-                        })
-                        continue
+                        }
 
                     query_args = {"page_size": per_database_page_limit}
                     if db_start_cursor:
                         query_args["start_cursor"] = db_start_cursor
-                    pages = fetcher.query_database(db_id, query_args)
-
-                    expanded_pages = []
-                    for page in pages[:per_database_page_limit]:
-                        try:
-                            # 3) Recursively fetch page blocks
-                            content_text = ""
-                            elements = []
-                            total_blocks = 0
-                            if include_blocks:
-                                page_full = fetcher.fetch_page_with_blocks(page["id"]) 
-                                blocks = page_full.get("blocks", [])
-                                total_blocks = page_full.get("total_blocks", 0)
-                                # 4) Format for LLM per requested format
-                                if fmt in ("text", "both"):
-                                    content_text = parser.flatten_blocks_to_text(blocks)
-                                if fmt in ("elements", "both"):
-                                    elements = parser.blocks_to_elements(blocks)
-                            expanded_pages.append({
-                                "id": page["id"],
-                                "title": page.get("title"),
-                                "url": page.get("url"),
-                                **({"content_text": content_text} if fmt in ("text", "both") else {}),
-                                **({"elements": elements} if fmt in ("elements", "both") else {}),
-                                "total_blocks": total_blocks
-                            })
-                        except Exception as e:
-                            # Per-page error: continue other pages
-                            logger.warning(f"Failed to fetch/parse page {page.get('id')}: {e}")
-                            expanded_pages.append({
-                                "id": page.get("id"),
-                                "title": page.get("title"),
-                                "url": page.get("url"),
-                                "error": str(e)
-                            })
-
-                    final_results.append({
+                    pages = await fetcher.query_database(db_id, query_args, limit=per_database_page_limit)
+
+                    expanded_pages = await asyncio.gather(
+                        *(_expand_page(page) for page in pages)
+                    )
+
+                    return {
                         "object_type": "database",
                         "id": db_id,
                         "title": db_title,
                         "url": match.get("url"),
                         "last_edited": match.get("last_edited"),
-                        "pages": expanded_pages
-                    })
+                        "pages": list(expanded_pages)
+                    }
                 else:
                     # Treat as single page
                     page_id = match.get("id")
@@ -333,43 +404,54 @@ async def query_notion(
                     elements = []
                     total_blocks = 0
                     if include_blocks:
-                        page_full = fetcher.fetch_page_with_blocks(page_id)
+                        page_full = await fetcher.fetch_page_with_blocks_cached(page_id, match.get("last_edited"))
                         blocks = page_full.get("blocks", [])
                         total_blocks = page_full.get("total_blocks", 0)
-                        if fmt in ("text", "both"):
-                            content_text = parser.flatten_blocks_to_text(blocks)
-                        if fmt in ("elements", "both"):
-                            elements = parser.blocks_to_elements(blocks)
-                    final_results.append({
+                        content_text, elements = _PARSER.parse_both(blocks, want_text, want_elems)
+                    result = {
                         "object_type": "page",
                         "id": page_id,
                         "title": match.get("title"),
                         "url": match.get("url"),
                         "last_edited": match.get("last_edited"),
                         "total_blocks": total_blocks,
-                        **({"content_text": content_text} if fmt in ("text", "both") else {}),
-                        **({"elements": elements} if fmt in ("elements", "both") else {})
-                    })
+                    }
+                    if want_text:
+                        result["content_text"] = content_text
+                    if want_elems:
+                        result["elements"] = elements
+                    return result
             except Exception as e:
                 # Per-object error: include error but keep other objects
                 logger.warning(f"Failed to process search match {match.get('id')}: {e}")
-                final_results.append({
+                return {
                     "object_type": obj_type,
                     "id": match.get("id"),
                     "title": match.get("title"),
                     "url": match.get("url"),
                     "error": str(e)
-                })
+                }
+
+        final_results = list(await asyncio.gather(*(_process_match(m) for m in top_matches)))
 
         logger.info(f"Query '{q}' integration returned {len(final_results)} result entries")
-        return QueryResponse(query=q, results=final_results, status="success")
+        # The results were built here from trusted data; serialize them
+        # directly instead of re-validating against QueryResponse. OPT_UTC_Z
+        # keeps the "Z" suffix pydantic used for UTC timestamps. The
+        # timestamp changes the body on every render, so /query has no ETag.
+        body = orjson.dumps(
+            {"query": q, "results": final_results, "status": "success", "timestamp": datetime.now()},
+            option=orjson.OPT_UTC_Z
+        )
+        headers = _NO_STORE_HEADERS if _has_errors(final_results, "pages") else None
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except ValueError as e:
         logger.warning(f"Invalid query parameter: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except ConnectionError as e:
         logger.error(f"Notion API connection error for query '{q}': {e}")
-        raise HTTPException(status_code=503, detail="Notion API connection failed")
+        raise HTTPException(status_code=503, detail=_CONN_ERR_DETAIL)
     except Exception as e:
         logger.error(f"Query processing failed for '{q}': {e}")
         raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
@@ -384,77 +466,102 @@ async def export_database(
     """Export pages from a specific Notion database with optional blocks.
 
     Steps:
-    1) Query database pages with pagination (fetcher.query_database)
+    1) Stream database pages with pagination (fetcher.iter_query_database)
     2) For each page, optionally fetch blocks (fetcher.fetch_page_with_blocks)
-    3) Format using parser (parser.flatten_blocks_to_text / blocks_to_elements)
-    4) Return results and a cursor for continuing export
+    3) Format using parser (parser.parse_both, one pass over the blocks)
+    4) Stream one NDJSON record per page, in completion order
+
+    If Notion fails after streaming has started, the stream ends with a
+    ``{"error": ..., "complete": false}`` record.
     """
     try:
         # Bounds and format normalization
         fmt = (format or "both").lower()
         if fmt not in ("text", "elements", "both"):
             fmt = "both"
+        want_text = fmt in ("text", "both")
+        want_elems = fmt in ("elements", "both")
 
-        parser = NotionParser()
-
-        # Query entire database (no page limit) leveraging built-in pagination
-        # Note: query_database returns already-processed page metadata
-        processed_pages = fetcher.query_database(database_id)
+        # Walk the entire database (no page limit) one Notion result page at
+        # a time; records are already-processed page metadata. The first
+        # response is awaited here so query errors still map to HTTP statuses.
+        records = fetcher.iter_query_database(database_id)
+        first_record = await anext(records, None)
 
-        results = []
-        for meta in processed_pages:
+        async def _export_page(meta):
             try:
                 # Minimal page metadata
-                page_id = meta.get("id")
+                page_id = meta.id
 
                 content_text = ""
                 elements = []
                 total_blocks = 0
                 if include_blocks and page_id:
-                    page_full = fetcher.fetch_page_with_blocks(page_id)
+                    page_full = await fetcher.fetch_page_with_blocks_cached(page_id, meta.last_edited_time)
                     blocks = page_full.get("blocks", [])
                     total_blocks = page_full.get("total_blocks", 0)
-                    if fmt in ("text", "both"):
-                        content_text = parser.flatten_blocks_to_text(blocks)
-                    if fmt in ("elements", "both"):
-                        elements = parser.blocks_to_elements(blocks)
-
-                results.append({
-                    **({
-                        "id": meta.get("id"),
-                        "title": meta.get("title"),
-                        "url": meta.get("url"),
-                        "created_time": meta.get("created_time"),
-                        "last_edited_time": meta.get("last_edited_time"),
-                    }),
+                    content_text, elements = _PARSER.parse_both(blocks, want_text, want_elems)
+
+                record = {
+                    "id": meta.id,
+                    "title": meta.title,
+                    "url": meta.url,
+                    "created_time": meta.created_time,
+                    "last_edited_time": meta.last_edited_time,
                     "total_blocks": total_blocks,
-                    **({"content_text": content_text} if fmt in ("text", "both") else {}),
-                    **({"elements": elements} if fmt in ("elements", "both") else {}),
-                })
+                }
+                if want_text:
+                    record["content_text"] = content_text
+                if want_elems:
+                    record["elements"] = elements
+                return record
             except Exception as e:
-                logger.warning(f"Failed to export page {meta.get('id')}: {e}")
-                results.append({"id": meta.get("id"), "error": str(e)})
-
-        return {
-            "database_id": database_id,
-            "count": len(results),
-            "has_more": False,
-            "next_cursor": None,
-            "results": results,
-        }
+                logger.warning(f"Failed to export page {meta.id}: {e}")
+                return {"id": meta.id, "error": str(e)}
+
+        async def _stream_records():
+            # Sliding window of in-flight page exports: each record is written
+            # as soon as it completes, so memory stays bounded by the window
+            # rather than by the size of the database.
+            meta = first_record
+            pending = set()
+            try:
+                while True:
+                    while meta is not None and len(pending) < _PAGE_FETCH_CONCURRENCY:
+                        pending.add(asyncio.create_task(_export_page(meta)))
+                        meta = await anext(records, None)
+                    if not pending:
+                        break
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield orjson.dumps(task.result()) + b"\n"
+            except Exception as e:
+                # Headers are already sent, so the status cannot change; end
+                # with a record marking the export as incomplete instead
+                logger.error(f"Export of database {database_id} stopped: {e}")
+                yield orjson.dumps({"error": str(e), "complete": False}) + b"\n"
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                await records.aclose()
+
+        return StreamingResponse(_stream_records(), media_type="application/x-ndjson")
 
     except ValueError as e:
         logger.warning(f"Invalid export parameter: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except ConnectionError as e:
         logger.error(f"Notion API connection error for export of '{database_id}': {e}")
-        raise HTTPException(status_code=503, detail="Notion API connection failed")
+        raise HTTPException(status_code=503, detail=_CONN_ERR_DETAIL)
     except Exception as e:
         logger.error(f"Database export failed for '{database_id}': {e}")
         raise HTTPException(status_code=500, detail=f"Database export failed: {str(e)}")
 
 @router.get("/search/databases")
+@cache_response(expire=_RESPONSE_CACHE_SECONDS)
 async def search_databases(
+    request: Request,
     q: str,
     max_results: int = 10,
     per_database_page_limit: int = 10,
@@ -473,99 +580,100 @@ async def search_databases(
     - Return structured JSON with database metadata and page items
     """
     try:
-        max_results = 50 if max_results > 50 else max_results
-        max_results = 1 if max_results < 1 else max_results
-        per_database_page_limit = 50 if per_database_page_limit > 50 else per_database_page_limit
-        per_database_page_limit = 1 if per_database_page_limit < 1 else per_database_page_limit
+        max_results = max(1, min(50, max_results))
+        per_database_page_limit = max(1, min(50, per_database_page_limit))
 
         fmt = (format or "both").lower()
         if fmt not in ("text", "elements", "both"):
             fmt = "both"
+        want_text = fmt in ("text", "both")
+        want_elems = fmt in ("elements", "both")
         if minimal_mode not in ("string", "lines"):
             minimal_mode = "string"
 
-        parser = NotionParser()
+        db_matches = await searcher.search_pages_and_databases(q, max_results=max_results, kind="database")
 
-        matches = searcher.search_pages_and_databases(q, max_results=max_results)
-        db_matches = [m for m in matches if m.get("object_type") == "database"]
+        async def _process_item(p):
+            try:
+                content_text = ""
+                elements = []
+                total_blocks = 0
+                if include_blocks:
+                    full = await fetcher.fetch_page_with_blocks_cached(p.id, p.last_edited_time)
+                    blocks = full.get("blocks", [])
+                    total_blocks = full.get("total_blocks", 0)
+                    content_text, elements = _PARSER.parse_both(blocks, want_text, want_elems)
+                # parse_both already sanitizes content_text
+                if minimal:
+                    minimal_item = {"title": _PARSER.sanitize_text(p.title or "")}
+                    if want_text:
+                        if minimal_mode == "lines":
+                            minimal_item["content_lines"] = content_text.split("\n")
+                        else:
+                            minimal_item["content"] = content_text
+                    return minimal_item
+                item = {
+                    "id": p.id,
+                    "title": _PARSER.sanitize_text(p.title or ""),
+                    "url": p.url,
+                    "created_time": p.created_time,
+                    "last_edited_time": p.last_edited_time,
+                    "total_blocks": total_blocks,
+                }
+                if want_text:
+                    item["content_text"] = content_text
+                if want_elems:
+                    item["elements"] = elements
+                return item
+            except Exception as e:
+                logger.warning(f"Failed to process page {p.id}: {e}")
+                return {"id": p.id, "title": p.title, "error": str(e)}
 
-        results = []
-        for db in db_matches:
+        async def _process_database(db):
             try:
                 db_id = db.get("id")
-                pages = fetcher.query_database(db_id, {"page_size": per_database_page_limit})
-                items = []
-                for p in pages[:per_database_page_limit]:
-                    try:
-                        content_text = ""
-                        elements = []
-                        total_blocks = 0
-                        if include_blocks:
-                            full = fetcher.fetch_page_with_blocks(p["id"]) 
-                            blocks = full.get("blocks", [])
-                            total_blocks = full.get("total_blocks", 0)
-                            if fmt in ("text", "both"):
-                                content_text = parser.flatten_blocks_to_text(blocks)
-                            if fmt in ("elements", "both"):
-                                elements = parser.blocks_to_elements(blocks)
-                        if minimal:
-                            items.append({
-                                "title": parser.sanitize_text(p.get("title") or ""),
-                                **(
-                                    {"content": parser.sanitize_text(content_text)}
-                                    if fmt in ("text", "both") and minimal_mode == "string" else {}
-                                ),
-                                **(
-                                    {"content_lines": parser.sanitize_text(content_text).split("\n")}
-                                    if fmt in ("text", "both") and minimal_mode == "lines" else {}
-                                )
-                            })
-                        else:
-                            items.append({
-                                "id": p.get("id"),
-                                "title": parser.sanitize_text(p.get("title") or ""),
-                                "url": p.get("url"),
-                                "created_time": p.get("created_time"),
-                                "last_edited_time": p.get("last_edited_time"),
-                                "total_blocks": total_blocks,
-                                **({"content_text": parser.sanitize_text(content_text)} if fmt in ("text", "both") else {}),
-                                **({"elements": elements} if fmt in ("elements", "both") else {}),
-                            })
-                    except Exception as e:
-                        logger.warning(f"Failed to process page {p.get('id')}: {e}")
-                        items.append({"id": p.get("id"), "title": p.get("title"), "error": str(e)})
+                pages = await fetcher.query_database(
+                    db_id, {"page_size": per_database_page_limit}, limit=per_database_page_limit
+                )
+                items = list(await asyncio.gather(
+                    *(_process_item(p) for p in pages)
+                ))
 
                 if minimal:
-                    results.append({
+                    return {
                         "database": db.get("title"),
                         "items": items
-                    })
-                else:
-                    results.append({
-                        "id": db_id,
-                        "title": db.get("title"),
-                        "url": db.get("url"),
-                        "last_edited": db.get("last_edited"),
-                        "items": items
-                    })
+                    }
+                return {
+                    "id": db_id,
+                    "title": db.get("title"),
+                    "url": db.get("url"),
+                    "last_edited": db.get("last_edited"),
+                    "items": items
+                }
             except Exception as e:
                 logger.warning(f"Failed to expand database {db.get('id')}: {e}")
-                results.append({"id": db.get("id"), "title": db.get("title"), "error": str(e)})
+                return {"id": db.get("id"), "title": db.get("title"), "error": str(e)}
 
-        return {"query": q, "results": results}
+        results = list(await asyncio.gather(*(_process_database(db) for db in db_matches)))
+
+        headers = _NO_STORE_HEADERS if _has_errors(results, "items") else None
+        return ORJSONResponse({"query": q, "results": results}, headers=headers)
 
     except ValueError as e:
         logger.warning(f"Invalid query parameter: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except ConnectionError as e:
         logger.error(f"Notion API connection error for db search '{q}': {e}")
-        raise HTTPException(status_code=503, detail="Notion API connection failed")
+        raise HTTPException(status_code=503, detail=_CONN_ERR_DETAIL)
     except Exception as e:
         logger.error(f"Database search failed for '{q}': {e}")
         raise HTTPException(status_code=500, detail=f"Database search failed: {str(e)}")
 
 @router.get("/search/pages")
+@cache_response(expire=_RESPONSE_CACHE_SECONDS)
 async def search_pages_endpoint(
+    request: Request,
     q: str,
     max_results: int = 10,
     include_blocks: bool = True,
@@ -583,67 +691,64 @@ async def search_pages_endpoint(
     - Return structured JSON with page metadata and content blobs
     """
     try:
-        max_results = 50 if max_results > 50 else max_results
-        max_results = 1 if max_results < 1 else max_results
+        max_results = max(1, min(50, max_results))
 
         fmt = (format or "both").lower()
         if fmt not in ("text", "elements", "both"):
             fmt = "both"
+        want_text = fmt in ("text", "both")
+        want_elems = fmt in ("elements", "both")
         if minimal_mode not in ("string", "lines"):
             minimal_mode = "string"
 
-        parser = NotionParser()
-        matches = searcher.search_pages_and_databases(q, max_results=max_results)
-        page_matches = [m for m in matches if m.get("object_type") == "page"]
+        page_matches = await searcher.search_pages_and_databases(q, max_results=max_results, kind="page")
 
-        results = []
-        for m in page_matches:
+        async def _process_match(m):
             try:
                 content_text = ""
                 elements = []
                 total_blocks = 0
                 if include_blocks:
-                    full = fetcher.fetch_page_with_blocks(m.get("id"))
+                    full = await fetcher.fetch_page_with_blocks_cached(m.get("id"), m.get("last_edited"))
                     blocks = full.get("blocks", [])
                     total_blocks = full.get("total_blocks", 0)
-                    if fmt in ("text", "both"):
-                        content_text = parser.flatten_blocks_to_text(blocks)
-                    if fmt in ("elements", "both"):
-                        elements = parser.blocks_to_elements(blocks)
+                    content_text, elements = _PARSER.parse_both(blocks, want_text, want_elems)
+                # parse_both already sanitizes content_text
                 if minimal:
-                    results.append({
-                        "title": parser.sanitize_text(m.get("title") or ""),
-                        **(
-                            {"content": parser.sanitize_text(content_text)}
-                            if fmt in ("text", "both") and minimal_mode == "string" else {}
-                        ),
-                        **(
-                            {"content_lines": parser.sanitize_text(content_text).split("\n")}
-                            if fmt in ("text", "both") and minimal_mode == "lines" else {}
-                        )
-                    })
-                else:
-                    results.append({
-                        "id": m.get("id"),
-                        "title": parser.sanitize_text(m.get("title") or ""),
-                        "url": m.get("url"),
-                        "last_edited": m.get("last_edited"),
-                        "total_blocks": total_blocks,
-                        **({"content_text": parser.sanitize_text(content_text)} if fmt in ("text", "both") else {}),
-                        **({"elements": elements} if fmt in ("elements", "both") else {}),
-                    })
+                    minimal_item = {"title": _PARSER.sanitize_text(m.get("title") or "")}
+                    if want_text:
+                        if minimal_mode == "lines":
+                            minimal_item["content_lines"] = content_text.split("\n")
+                        else:
+                            minimal_item["content"] = content_text
+                    return minimal_item
+                result = {
+                    "id": m.get("id"),
+                    "title": _PARSER.sanitize_text(m.get("title") or ""),
+                    "url": m.get("url"),
+                    "last_edited": m.get("last_edited"),
+                    "total_blocks": total_blocks,
+                }
+                if want_text:
+                    result["content_text"] = content_text
+                if want_elems:
+                    result["elements"] = elements
+                return result
             except Exception as e:
                 logger.warning(f"Failed to parse page {m.get('id')}: {e}")
-                results.append({"id": m.get("id"), "title": m.get("title"), "error": str(e)})
+                return {"id": m.get("id"), "title": m.get("title"), "error": str(e)}
+
+        results = list(await asyncio.gather(*(_process_match(m) for m in page_matches)))
 
-        return {"query": q, "results": results}
+        headers = _NO_STORE_HEADERS if _has_errors(results, "pages") else None
+        return ORJSONResponse({"query": q, "results": results}, headers=headers)
 
     except ValueError as e:
         logger.warning(f"Invalid query parameter: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except ConnectionError as e:
         logger.error(f"Notion API connection error for page search '{q}': {e}")
-        raise HTTPException(status_code=503, detail="Notion API connection failed")
+        raise HTTPException(status_code=503, detail=_CONN_ERR_DETAIL)
     except Exception as e:
         logger.error(f"Page search failed for '{q}': {e}")
         raise HTTPException(status_code=500, detail=f"Page search failed: {str(e)}")
@@ -1,8 +1,9 @@
 """Configuration settings for the Notion Context Service."""
 
 import os
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
-from typing import Optional
+from typing import List, Optional
 import logging
 
 # Load environment variables
@@ -10,48 +11,60 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def _get_notion_api_key() -> str:
+    """Get and validate the Notion API key from environment variables.
+    
+    Returns:
+        The Notion API key, or an empty string if it is not set
+    """
+    api_key = os.getenv("NOTION_API_KEY")
+    
+    if not api_key:
+        logger.warning("NOTION_API_KEY not found in environment variables")
+        return ""
+    
+    # Basic validation - Notion API keys typically start with 'secret_'
+    if not api_key.startswith("secret_"):
+        logger.warning("NOTION_API_KEY does not appear to be a valid Notion integration token")
+    
+    return api_key
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables.
     
-    def __init__(self):
-        """Initialize settings and validate required configurations."""
-        # Notion API Configuration
-        self.notion_api_key: str = self._get_notion_api_key()
-        self.notion_database_id: Optional[str] = os.getenv("NOTION_DATABASE_ID")
-        
-        # Server Configuration
-        self.host: str = os.getenv("HOST", "0.0.0.0")
-        self.port: int = int(os.getenv("PORT", "8000"))
-        self.debug: bool = os.getenv("DEBUG", "True").lower() == "true"
-        
-        # API Configuration
-        self.title: str = "Notion Context Service"
-        self.description: str = "REST API service to deliver Notion context for LLM analysis"
-        self.version: str = "1.0.0"
-        
-        # Validate configuration
-        self._validate_config()
+    Values are read once when the instance is created and frozen afterwards,
+    so anything derived from them at import time cannot go stale.
+    """
     
-    def _get_notion_api_key(self) -> str:
-        """Get and validate the Notion API key from environment variables.
-        
-        Returns:
-            The Notion API key
-            
-        Raises:
-            ValueError: If the API key is not found or invalid
-        """
-        api_key = os.getenv("NOTION_API_KEY")
-        
-        if not api_key:
-            logger.warning("NOTION_API_KEY not found in environment variables")
-            return ""
-        
-        # Basic validation - Notion API keys typically start with 'secret_'
-        if not api_key.startswith("secret_"):
-            logger.warning("NOTION_API_KEY does not appear to be a valid Notion integration token")
-        
-        return api_key
+    # Notion API Configuration
+    notion_api_key: str = field(default_factory=_get_notion_api_key, repr=False)
+    notion_database_id: Optional[str] = field(default_factory=lambda: os.getenv("NOTION_DATABASE_ID"))
+    notion_concurrency: int = field(default_factory=lambda: int(os.getenv("NOTION_CONCURRENCY", "5")))
+    
+    # Server Configuration
+    host: str = field(default_factory=lambda: os.getenv("HOST", "0.0.0.0"))
+    port: int = field(default_factory=lambda: int(os.getenv("PORT", "8000")))
+    debug: bool = field(default_factory=lambda: os.getenv("DEBUG", "True").lower() == "true")
+    # Comma-separated browser origins allowed to call the API ("*" for any)
+    cors_origins: List[str] = field(default_factory=lambda: [
+        origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+    ])
+    # Worker processes for `python -m app.main`; ignored when DEBUG enables reload
+    workers: int = field(default_factory=lambda: int(os.getenv("WORKERS", str(os.cpu_count() or 1))))
+    
+    # Cache Configuration
+    cache_ttl_seconds: int = field(default_factory=lambda: int(os.getenv("CACHE_TTL_SECONDS", "300")))
+    redis_url: Optional[str] = field(default_factory=lambda: os.getenv("REDIS_URL"), repr=False)
+    
+    # API Configuration
+    title: str = "Notion Context Service"
+    description: str = "REST API service to deliver Notion context for LLM analysis"
+    version: str = "1.0.0"
+    
+    def __post_init__(self):
+        """Validate required configurations."""
+        self._validate_config()
     
     def _validate_config(self) -> None:
         """Validate the configuration settings."""
@@ -74,3 +87,7 @@ class Settings:
 
 # Global settings instance
 settings = Settings()
+
+# Hot-path values as plain module constants
+NOTION_API_KEY = settings.notion_api_key
+VERSION = settings.version
@@ -1,12 +1,16 @@
 """Main FastAPI application for Notion Context Service."""
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
+import sys
 import uvicorn
 
-from .config import settings
-from .api.endpoints import router
+from .config import NOTION_API_KEY, settings
+from .api.endpoints import router, get_notion_client, close_notion_client
+from .notion.cache import init_cache, close_cache, begin_request, summarize_statuses
 
 # Configure logging
 logging.basicConfig(
@@ -15,24 +19,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown.
+    
+    The shared Notion client (and its connection pool) is created and its
+    credentials checked before the first request is served, and it is
+    closed when the application stops.
+    """
+    logger.info(f"Starting {settings.title} v{settings.version}")
+    
+    await init_cache(settings.redis_url)
+    
+    # Validate configuration
+    if not NOTION_API_KEY:
+        logger.warning("Notion API key not configured - some endpoints may not work")
+    else:
+        # Check the credentials once before serving; requests do not repeat it
+        try:
+            client = await get_notion_client()
+            await client.ensure_ready()
+        except Exception as e:
+            logger.warning(f"Notion API check failed at startup, requests will report errors as they occur: {e}")
+    
+    if not settings.notion_database_id:
+        logger.info("Notion database ID not configured - using search across all accessible pages")
+    
+    yield
+    
+    logger.info(f"Shutting down {settings.title}")
+    await close_notion_client()
+    await close_cache()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.title,
     description=settings.description,
     version=settings.version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware. Credentials are only allowed for an explicit origin
+# list, since browsers reject them with a wildcard origin.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    allow_credentials="*" not in settings.cors_origins,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag", "X-Cache"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
+@app.middleware("http")
+async def add_cache_header(request: Request, call_next):
+    """Report whether cached Notion responses served the request (X-Cache)."""
+    statuses = begin_request()
+    response = await call_next(request)
+    cache_status = summarize_statuses(statuses)
+    if cache_status:
+        response.headers["X-Cache"] = cache_status
+    return response
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
 
@@ -48,28 +99,16 @@ async def root():
         "query": "/api/v1/query?q=your_query_here"
     }
 
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event."""
-    logger.info(f"Starting {settings.title} v{settings.version}")
-    
-    # Validate configuration
-    if not settings.notion_api_key:
-        logger.warning("Notion API key not configured - some endpoints may not work")
-    
-    if not settings.notion_database_id:
-        logger.info("Notion database ID not configured - using search across all accessible pages")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown event."""
-    logger.info(f"Shutting down {settings.title}")
-
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
-        log_level="info"
+        # Uvicorn cannot reload and run multiple workers at once
+        workers=1 if settings.debug else settings.workers,
+        log_level="info",
+        # uvloop and httptools ship with uvicorn[standard] but are unavailable on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="h11" if sys.platform == "win32" else "httptools",
     )
@@ -0,0 +1,345 @@
+"""Optional Redis cache and request coalescing for Notion API and HTTP responses."""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+
+import httpx
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from notion_client.errors import RequestTimeoutError
+
+from .errors import api_error_status, iter_error_chain
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; without it caching is disabled
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """TTL bounds, in seconds, for one class of cached Notion responses."""
+    
+    min_ttl: int
+    max_ttl: int
+
+# short: search results, normal: page metadata and content, long: database schemas
+POLICIES = {
+    "short": CachePolicy(min_ttl=5, max_ttl=15),
+    "normal": CachePolicy(min_ttl=60, max_ttl=300),
+    "long": CachePolicy(min_ttl=300, max_ttl=3600),
+}
+
+# Each second a Notion call took adds this many seconds to its TTL (within the
+# policy bounds), so responses that are expensive to recompute live longer
+_TTL_PER_FETCH_SECOND = 100
+
+# Expired entries are kept this much longer to be served if Notion is failing
+_STALE_GRACE_SECONDS = 3600
+
+_redis = None
+
+# Cache outcomes ("HIT", "MISS", "STALE") of the Notion calls made while
+# serving the current request; installed per request by begin_request()
+_request_statuses: ContextVar[Optional[List[str]]] = ContextVar("notion_cache_statuses", default=None)
+
+
+async def init_cache(redis_url: Optional[str]) -> None:
+    """Connect the response cache to Redis.
+    
+    Caching stays disabled when no URL is configured or the redis package is
+    not installed.
+    
+    Args:
+        redis_url: Redis connection URL, e.g. ``redis://localhost:6379/0``
+    """
+    global _redis
+    if not redis_url:
+        logger.info("REDIS_URL not configured - Notion response cache disabled")
+        return
+    if aioredis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed - Notion response cache disabled")
+        return
+    
+    _redis = aioredis.from_url(redis_url)
+    logger.info("Notion response cache enabled")
+
+
+async def close_cache() -> None:
+    """Close the Redis connection, if one was opened."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def begin_request() -> List[str]:
+    """Start collecting cache outcomes for the current request.
+    
+    Returns:
+        The list that cached calls made while serving the request append to
+    """
+    statuses: List[str] = []
+    _request_statuses.set(statuses)
+    return statuses
+
+
+def summarize_statuses(statuses: List[str]) -> Optional[str]:
+    """Reduce a request's cache outcomes to a single X-Cache value.
+    
+    Args:
+        statuses: Outcomes collected since begin_request()
+    
+    Returns:
+        "STALE" if any stale entry was served, else "MISS" if any call reached
+        Notion, else "HIT"; None if no cached call was made
+    """
+    if not statuses:
+        return None
+    if "STALE" in statuses:
+        return "STALE"
+    if "MISS" in statuses:
+        return "MISS"
+    return "HIT"
+
+
+def _record(status: str) -> None:
+    """Record a cache outcome against the current request, if any."""
+    statuses = _request_statuses.get()
+    if statuses is not None:
+        statuses.append(status)
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Check whether an error (or one it wraps) means Notion itself failed.
+    
+    Args:
+        error: Exception raised by a cached call
+    
+    Returns:
+        True for Notion 5xx responses, timeouts and transport errors
+    """
+    status = api_error_status(error)
+    if status is not None:
+        return status >= 500
+    return any(
+        isinstance(current, (RequestTimeoutError, httpx.TransportError))
+        for current in iter_error_chain(error)
+    )
+
+
+def _call_key(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Build the cache and coalescing key for one method call."""
+    digest = hashlib.sha1(
+        orjson.dumps([args, kwargs], option=orjson.OPT_SORT_KEYS, default=str)
+    ).hexdigest()
+    return f"notion:{func.__name__}:{digest}"
+
+
+def _coalesce(inflight: Dict[str, asyncio.Task], key: str,
+              call: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+    """Share one in-flight call among all concurrent callers with the same key.
+    
+    The first caller starts the call as a task; later callers await the same
+    task until it finishes. Each caller awaits it through ``asyncio.shield``
+    so a cancelled caller does not cancel the call for the others.
+    
+    Args:
+        inflight: Owner's map of key -> running task
+        key: Call key from _call_key()
+        call: Zero-argument coroutine function issuing the call
+    
+    Returns:
+        Awaitable resolving to the shared call's result
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(call())
+        inflight[key] = task
+        
+        def _done(finished: asyncio.Task) -> None:
+            inflight.pop(key, None)
+            # Mark the error as retrieved in case every caller was cancelled
+            if not finished.cancelled():
+                finished.exception()
+        
+        task.add_done_callback(_done)
+    return asyncio.shield(task)
+
+
+def coalesced(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Coalesce concurrent identical calls to an async NotionClient method.
+    
+    Callers share the result (or error) of a single Notion request, so they
+    must not mutate it. The owner must provide an ``_inflight`` dict.
+    
+    Args:
+        func: Async method whose arguments are JSON-serializable
+    
+    Returns:
+        Wrapped method
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        key = _call_key(func, args, kwargs)
+        return await _coalesce(self._inflight, key, lambda: func(self, *args, **kwargs))
+    
+    return wrapper
+
+
+def cached(policy: str = "normal") -> Callable:
+    """Cache the JSON result of an async NotionClient method in Redis.
+    
+    Entries are keyed by method name and a hash of the call arguments. When
+    a refresh fails because Notion is unavailable, the last stored result is
+    served instead. Concurrent misses for the same key are coalesced into a
+    single Notion call (see ``coalesced``), with or without Redis. Passing
+    ``refresh=True`` to the wrapped method skips a fresh stored result and
+    calls Notion, storing what it returns.
+    
+    Args:
+        policy: Name of the TTL policy in POLICIES
+    
+    Returns:
+        Decorator for async methods whose results are JSON-serializable
+    """
+    bounds = POLICIES[policy]
+    
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def _fetch_and_store(self, key: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+            """Call Notion once and store the result for every waiting caller."""
+            started = time.perf_counter()
+            result = await func(self, *args, **kwargs)
+            elapsed = time.perf_counter() - started
+            if _redis is None:
+                return result
+            
+            ttl = int(max(bounds.min_ttl, min(bounds.max_ttl, bounds.min_ttl + elapsed * _TTL_PER_FETCH_SECOND)))
+            try:
+                async with _redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, mapping={
+                        "body": orjson.dumps(result),
+                        "fresh_until": time.time() + ttl,
+                    })
+                    pipe.expire(key, ttl + _STALE_GRACE_SECONDS)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Cache write failed for {key}: {e}")
+            return result
+        
+        @functools.wraps(func)
+        async def wrapper(self, *args: Any, refresh: bool = False, **kwargs: Any) -> Any:
+            key = _call_key(func, args, kwargs)
+            
+            stale_body = None
+            if _redis is not None:
+                try:
+                    body, fresh_until = await _redis.hmget(key, "body", "fresh_until")
+                    if body is not None:
+                        if not refresh and float(fresh_until) > time.time():
+                            _record("HIT")
+                            return orjson.loads(body)
+                        stale_body = body
+                except Exception as e:
+                    logger.warning(f"Cache read failed for {key}: {e}")
+            
+            try:
+                result = await _coalesce(
+                    self._inflight, key, lambda: _fetch_and_store(self, key, args, kwargs)
+                )
+            except Exception as e:
+                if stale_body is not None and _is_upstream_failure(e):
+                    logger.warning(f"Notion unavailable, serving stale {func.__name__} result: {e}")
+                    _record("STALE")
+                    return orjson.loads(stale_body)
+                raise
+            if _redis is not None:
+                _record("MISS")
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+def cache_response(expire: int = 30, public: bool = False, etag: bool = True) -> Callable:
+    """Cache the full response of a GET endpoint in Redis.
+    
+    The endpoint must accept a ``request: Request`` argument and return a
+    non-streaming Response. Entries are keyed by path and sorted query
+    parameters; only 200 responses are stored. Stored responses carry a
+    ``private`` Cache-Control header, since the content comes from a Notion
+    workspace, and an ETag so a matching If-None-Match is answered with 304.
+    
+    Responses that set their own Cache-Control (e.g. ``no-store`` for partial
+    results) are passed through and never stored. Without Redis every
+    response is passed through unchanged: an ETag computed from the rendered
+    body would not save any Notion calls.
+    
+    Args:
+        expire: Seconds a stored response is served and may be cached downstream
+        public: Allow shared caches (proxies, CDNs) to store the response
+        etag: Add an ETag; disable for bodies that differ on every render
+    
+    Returns:
+        Decorator for async FastAPI endpoint functions
+    """
+    scope = "public" if public else "private"
+    cache_control = f"{scope}, max-age={expire}, stale-while-revalidate={expire}"
+    
+    def decorator(func: Callable[..., Awaitable[Response]]) -> Callable[..., Awaitable[Response]]:
+        def _finish(request: Request, body: bytes, media_type: Optional[str], tag: str) -> Response:
+            """Build the outgoing response, or a 304 if the client's copy is current."""
+            headers = {"Cache-Control": cache_control}
+            if etag:
+                headers["ETag"] = tag
+                if request.headers.get("if-none-match") == tag:
+                    return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type=media_type, headers=headers)
+        
+        @functools.wraps(func)
+        async def wrapper(*args: Any, request: Request, **kwargs: Any) -> Response:
+            if _redis is None:
+                return await func(*args, request=request, **kwargs)
+            
+            digest = hashlib.sha1(
+                orjson.dumps(sorted(request.query_params.multi_items()))
+            ).hexdigest()
+            key = f"notion:http:{request.url.path}:{digest}"
+            
+            try:
+                body, media_type, tag = await _redis.hmget(key, "body", "media_type", "etag")
+                if body is not None:
+                    _record("HIT")
+                    return _finish(request, body, media_type.decode() or None, tag.decode())
+            except Exception as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+            
+            response = await func(*args, request=request, **kwargs)
+            if (response.status_code != 200 or not hasattr(response, "body")
+                    or "cache-control" in response.headers):
+                return response
+            
+            body = bytes(response.body)
+            media_type = response.media_type or ""
+            tag = f'"{hashlib.sha1(body).hexdigest()}"'
+            try:
+                async with _redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, mapping={"body": body, "media_type": media_type, "etag": tag})
+                    pipe.expire(key, expire)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Cache write failed for {key}: {e}")
+            return _finish(request, body, media_type or None, tag)
+        
+        return wrapper
+    
+    return decorator
@@ -1,14 +1,56 @@
 """Notion API client wrapper."""
 
-from notion_client import Client
-from typing import Optional, Dict, Any
+from notion_client import AsyncClient
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import httpx
 import logging
+import orjson
+from .cache import cached, coalesced
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by every call made through the NotionClient. All
+# traffic goes to a single host, so keep-alive connections are reused across
+# requests instead of paying a TLS handshake per call. Idle connections are
+# kept for a minute (httpx defaults to 5 seconds) so they survive the gaps
+# between bursts of requests.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0)
+_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+class _SDKClient(AsyncClient):
+    """Notion SDK client that encodes and decodes JSON bodies with orjson.
+    
+    The SDK uses the stdlib json module for every request and response, and
+    formats each response body into a debug log message even when debug
+    logging is off. Error responses are still parsed by the SDK so its
+    APIResponseError/HTTPResponseError mapping is unchanged.
+    """
+    
+    def _build_request(self, method: str, path: str, query: Optional[Dict[Any, Any]] = None,
+                       body: Optional[Dict[Any, Any]] = None, auth: Optional[str] = None) -> httpx.Request:
+        headers = httpx.Headers()
+        if auth:
+            headers["Authorization"] = f"Bearer {auth}"
+        content = None
+        if body is not None:
+            content = orjson.dumps(body)
+            headers["Content-Type"] = "application/json"
+        return self.client.build_request(method, path, params=query, content=content, headers=headers)
+    
+    def _parse_response(self, response: httpx.Response) -> Any:
+        if response.is_success:
+            return orjson.loads(response.content)
+        return super()._parse_response(response)
+
 class NotionClient:
-    """Wrapper for Notion API client with error handling."""
+    """Wrapper for Notion API client with error handling.
+    
+    Every Notion API call made by the service goes through this class, which
+    bounds the number of calls in flight with ``settings.notion_concurrency``
+    and lets concurrent identical calls share a single request.
+    """
     
     def __init__(self, api_key: str):
         """Initialize the Notion client.
@@ -19,76 +61,172 @@ class NotionClient:
         if not api_key:
             raise ValueError("Notion API key is required")
         
-        self.client = Client(auth=api_key)
-        self._test_connection()
+        self._http = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS)
+        self.client = _SDKClient(auth=api_key, client=self._http)
+        # The SDK resets the timeout on the client it is given
+        self._http.timeout = _HTTP_TIMEOUT
+        self._semaphore = asyncio.Semaphore(settings.notion_concurrency)
+        # Calls currently in flight, shared by concurrent identical callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._verified = False
+        self._verify_lock = asyncio.Lock()
     
-    def _test_connection(self) -> None:
+    async def _call(self, endpoint: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        """Invoke a Notion SDK endpoint, bounded by the client's semaphore.
+        
+        Args:
+            endpoint: Bound async SDK method, e.g. ``self.client.pages.retrieve``
+            **kwargs: Arguments forwarded to the endpoint
+        
+        Returns:
+            Parsed JSON response from the Notion API
+        """
+        async with self._semaphore:
+            return await endpoint(**kwargs)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self._http.aclose()
+    
+    async def _test_connection(self) -> None:
         """Test the connection to Notion API."""
         try:
             # Test connection by getting user info
-            self.client.users.me()
+            await self._call(self.client.users.me)
             logger.info("Successfully connected to Notion API")
         except Exception as e:
             logger.error(f"Failed to connect to Notion API: {e}")
             raise ConnectionError(f"Could not connect to Notion API: {e}")
     
-    def get_page(self, page_id: str) -> Dict[str, Any]:
+    async def ensure_ready(self) -> None:
+        """Verify the API key against Notion, at most once per client.
+        
+        Creating a client makes no Notion calls; call this where an early
+        credential check is wanted (e.g. at application startup). A failed
+        check is retried on the next call.
+        
+        Raises:
+            ConnectionError: If the connection to Notion API fails
+        """
+        if self._verified:
+            return
+        async with self._verify_lock:
+            if not self._verified:
+                await self._test_connection()
+                self._verified = True
+    
+    @cached(policy="normal")
+    async def get_page(self, page_id: str) -> Dict[str, Any]:
         """Retrieve a specific page by ID.
         
         Args:
             page_id: The ID of the page to retrieve
-            
+        
         Returns:
             Dictionary containing page data
-            
+        
         Raises:
             Exception: If page retrieval fails
         """
         try:
-            return self.client.pages.retrieve(page_id=page_id)
+            return await self._call(self.client.pages.retrieve, page_id=page_id)
         except Exception as e:
             logger.error(f"Failed to retrieve page {page_id}: {e}")
             raise Exception(f"Could not retrieve page {page_id}: {e}")
     
-    def get_page_content(self, page_id: str) -> Dict[str, Any]:
+    @cached(policy="normal")
+    async def get_page_content(self, page_id: str) -> Dict[str, Any]:
         """Retrieve the content blocks of a page.
         
         Args:
             page_id: The ID of the page to retrieve content for
-            
+        
         Returns:
             Dictionary containing page content blocks
-            
+        
         Raises:
             Exception: If content retrieval fails
         """
         try:
-            return self.client.blocks.children.list(block_id=page_id)
+            return await self._call(self.client.blocks.children.list, block_id=page_id)
         except Exception as e:
             logger.error(f"Failed to retrieve content for page {page_id}: {e}")
             raise Exception(f"Could not retrieve content for page {page_id}: {e}")
     
-    def search_pages(self, query: str, database_id: Optional[str] = None, 
-                    filter_properties: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    @coalesced
+    async def list_block_children(self, block_id: str, start_cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Retrieve one page of child blocks.
+        
+        Unlike get_page_content, SDK errors are raised unchanged so callers
+        can inspect them.
+        
+        Args:
+            block_id: The ID of the parent block or page
+            start_cursor: Pagination cursor from a previous response
+        
+        Returns:
+            Dictionary containing the child blocks and pagination fields
+        """
+        return await self._call(
+            self.client.blocks.children.list,
+            block_id=block_id,
+            start_cursor=start_cursor
+        )
+    
+    @coalesced
+    async def search(self, **params: Any) -> Dict[str, Any]:
+        """Run a raw Notion search; SDK errors are raised unchanged.
+        
+        Args:
+            **params: Search body parameters (query, filter, sort, page_size, ...)
+        
+        Returns:
+            Dictionary containing search results
+        """
+        return await self._call(self.client.search, **params)
+    
+    @coalesced
+    async def query_database(self, database_id: str, **params: Any) -> Dict[str, Any]:
+        """Run one raw database query; SDK errors are raised unchanged.
+        
+        Args:
+            database_id: The ID of the database to query
+            **params: Query body parameters (filter, sorts, page_size, start_cursor)
+        
+        Returns:
+            Dictionary containing the page records and pagination fields
+        """
+        return await self._call(self.client.databases.query, database_id=database_id, **params)
+    
+    @cached(policy="short")
+    async def search_pages(self, query: str, database_id: Optional[str] = None,
+                    filter_properties: Optional[Dict[str, Any]] = None,
+                    sort: Optional[Dict[str, str]] = None, page_size: int = 100) -> Dict[str, Any]:
         """Search for pages in Notion.
         
         Args:
             query: Search query string
             database_id: Optional database ID to limit search
             filter_properties: Optional properties to filter by
-            
+            sort: Optional Notion search sort, e.g.
+                ``{"direction": "descending", "timestamp": "last_edited_time"}``
+            page_size: Number of results to request (at most 100)
+        
         Returns:
             Dictionary containing search results
-            
+        
         Raises:
             Exception: If search fails
         """
         try:
             search_params = {
                 "query": query,
-                "page_size": 100  # Maximum page size
+                "page_size": page_size
             }
             
+            if sort:
+                search_params["sort"] = sort
+            
             if database_id:
                 search_params["filter"] = {
                     "property": "object",
@@ -100,57 +238,77 @@ class NotionClient:
                     search_params["filter"] = {}
                 search_params["filter"].update(filter_properties)
             
-            return self.client.search(**search_params)
+            return await self.search(**search_params)
         except Exception as e:
             logger.error(f"Failed to search pages with query '{query}': {e}")
             raise Exception(f"Search failed: {e}")
     
-    def get_database(self, database_id: str) -> Dict[str, Any]:
+    @cached(policy="long")
+    async def get_database(self, database_id: str) -> Dict[str, Any]:
         """Retrieve database information.
         
         Args:
             database_id: The ID of the database to retrieve
-            
+        
         Returns:
             Dictionary containing database data
-            
+        
         Raises:
             Exception: If database retrieval fails
         """
         try:
-            return self.client.databases.retrieve(database_id=database_id)
+            return await self._call(self.client.databases.retrieve, database_id=database_id)
         except Exception as e:
             logger.error(f"Failed to retrieve database {database_id}: {e}")
             raise Exception(f"Could not retrieve database {database_id}: {e}")
 
 
-def create_notion_client() -> NotionClient:
-    """Create and return a Notion client instance using the configured API key.
+# Process-wide client, created on first use (or at startup) and reused by
+# every request so its connection pool stays warm
+_client: Optional[NotionClient] = None
+
+
+async def create_notion_client() -> NotionClient:
+    """Return the shared Notion client, creating it on first use.
     
-    This helper function creates a NotionClient instance using the API key
-    loaded from the configuration settings.
+    The first call creates a NotionClient using the API key loaded from the
+    configuration settings; later calls return the same instance. No Notion
+    call is made here, so a cold request does not pay for a credential
+    check (see ``NotionClient.ensure_ready``).
     
     Returns:
         NotionClient: Configured Notion client instance
-        
+    
     Raises:
         ValueError: If the Notion API key is not configured
-        ConnectionError: If the connection to Notion API fails
     """
-    if not settings.is_notion_configured:
-        raise ValueError(
-            "Notion API key not configured. Please set NOTION_API_KEY in your .env file. "
-            "Get your integration token from: https://www.notion.so/my-integrations"
-        )
-    
-    logger.info("Creating Notion client with configured API key")
-    return NotionClient(api_key=settings.notion_api_key)
+    global _client
+    # No lock needed: nothing between the check and the assignment awaits,
+    # so concurrent first callers on the event loop cannot both create one
+    if _client is None:
+        if not settings.is_notion_configured:
+            raise ValueError(
+                "Notion API key not configured. Please set NOTION_API_KEY in your .env file. "
+                "Get your integration token from: https://www.notion.so/my-integrations"
+            )
+        
+        logger.info("Creating Notion client with configured API key")
+        _client = NotionClient(api_key=settings.notion_api_key)
+    return _client
+
+
+async def close_notion_client() -> None:
+    """Close the shared Notion client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
-def get_notion_client() -> NotionClient:
+async def get_notion_client() -> NotionClient:
     """Get a Notion client instance (alias for create_notion_client for consistency).
     
     Returns:
         NotionClient: Configured Notion client instance
     """
-    return create_notion_client()
+    return await create_notion_client()
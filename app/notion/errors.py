@@ -0,0 +1,41 @@
+"""Helpers for inspecting errors raised by Notion API calls."""
+
+from typing import Iterator, Optional
+
+from notion_client.errors import HTTPResponseError
+
+
+def iter_error_chain(error: BaseException) -> Iterator[BaseException]:
+    """Yield an error followed by the errors it wraps.
+    
+    NotionClient re-raises SDK errors wrapped in a plain Exception, so the
+    original error is reached through ``__cause__``/``__context__``.
+    
+    Args:
+        error: Exception to walk
+    
+    Yields:
+        The error itself, then each wrapped error in turn
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def api_error_status(error: BaseException) -> Optional[int]:
+    """Get the HTTP status of the Notion API response behind an error.
+    
+    Args:
+        error: Exception raised by (or wrapping an error from) a Notion call
+    
+    Returns:
+        The response status code, or None if the error did not come from a
+        Notion API response
+    """
+    for current in iter_error_chain(error):
+        if isinstance(current, HTTPResponseError):
+            return current.status
+    return None
@@ -1,15 +1,38 @@
 """Notion content fetcher for retrieving pages and content."""
 
-from typing import List, Dict, Any, Optional
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
+import asyncio
 import logging
 
+import ciso8601
+from cachetools import TTLCache
+
 from .client import NotionClient
-from .parser import NotionParser
+from .errors import api_error_status
+from .parser import default_parser
 from ..models.schema import NotionPage
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Worker tasks fetching a page's block tree; calls in flight are still capped
+# by the NotionClient semaphore
+_BLOCK_FETCH_WORKERS = 8
+
+@dataclass(frozen=True, slots=True)
+class ProcessedPage:
+    """Metadata of one page record returned by a database query."""
+    
+    id: str
+    title: str
+    url: str
+    created_time: datetime
+    last_edited_time: datetime
+    properties: Dict[str, Any] = field(default_factory=dict)
+
 class NotionFetcher:
     """Fetcher for retrieving and processing Notion content."""
     
@@ -20,9 +43,14 @@ class NotionFetcher:
             notion_client: Initialized Notion client
         """
         self.client = notion_client
-        self.parser = NotionParser()
+        self.parser = default_parser
+        # page_id -> (last_edited_time, fetch_page_with_blocks result)
+        self._page_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.cache_ttl_seconds)
+        # parent database ID ("__root__" for other parents) -> title property name;
+        # re-learned whenever the cached name no longer holds the title
+        self._title_prop_by_parent: Dict[str, str] = {}
     
-    def fetch_page(self, page_id: str, include_properties: bool = True) -> NotionPage:
+    async def fetch_page(self, page_id: str, include_properties: bool = True) -> NotionPage:
         """Fetch a single page by ID.
         
         Args:
@@ -36,11 +64,11 @@ class NotionFetcher:
             Exception: If page fetch fails
         """
         try:
-            # Fetch page data
-            page_data = self.client.get_page(page_id)
-            
-            # Fetch page content
-            content_data = self.client.get_page_content(page_id)
+            # Fetch page data and page content concurrently
+            page_data, content_data = await asyncio.gather(
+                self.client.get_page(page_id),
+                self.client.get_page_content(page_id)
+            )
             content_blocks = content_data.get("results", [])
             
             # Extract text content
@@ -71,7 +99,7 @@ class NotionFetcher:
             logger.error(f"Failed to fetch page {page_id}: {e}")
             raise Exception(f"Could not fetch page {page_id}: {e}")
     
-    def fetch_pages(self, page_ids: List[str], include_properties: bool = True) -> List[NotionPage]:
+    async def fetch_pages(self, page_ids: List[str], include_properties: bool = True) -> List[NotionPage]:
         """Fetch multiple pages by IDs.
         
         Args:
@@ -87,13 +115,19 @@ class NotionFetcher:
         pages = []
         errors = []
         
-        for page_id in page_ids:
-            try:
-                page = self.fetch_page(page_id, include_properties)
-                pages.append(page)
-            except Exception as e:
-                logger.error(f"Failed to fetch page {page_id}: {e}")
-                errors.append(f"Page {page_id}: {str(e)}")
+        # All pages are requested at once; NotionClient bounds how many
+        # Notion calls are actually in flight
+        results = await asyncio.gather(
+            *(self.fetch_page(page_id, include_properties) for page_id in page_ids),
+            return_exceptions=True
+        )
+        
+        for page_id, result in zip(page_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch page {page_id}: {result}")
+                errors.append(f"Page {page_id}: {str(result)}")
+            else:
+                pages.append(result)
         
         if errors and not pages:
             # If all pages failed, raise an exception
@@ -114,12 +148,24 @@ class NotionFetcher:
             Page title or fallback
         """
         properties = page_data.get("properties", {})
+        parent_key = (page_data.get("parent") or {}).get("database_id") or "__root__"
+        
+        # Pages sharing a parent database share its title property, so try
+        # the name found last time before scanning every property
+        prop_name = self._title_prop_by_parent.get(parent_key)
+        if prop_name is not None:
+            prop_data = properties.get(prop_name)
+            if prop_data and prop_data.get("type") == "title":
+                title = self.parser.extract_rich_text(prop_data.get("title", []))
+                if title:
+                    return title
         
         # Look for title property
         for prop_name, prop_data in properties.items():
             if prop_data.get("type") == "title":
+                self._title_prop_by_parent[parent_key] = prop_name
                 title_rich_text = prop_data.get("title", [])
-                title = self.parser._extract_rich_text(title_rich_text)
+                title = self.parser.extract_rich_text(title_rich_text)
                 if title:
                     return title
         
@@ -139,13 +185,14 @@ class NotionFetcher:
             return datetime.now()
         
         try:
-            # Notion uses ISO format with timezone info
-            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
+            # Notion uses ISO format with timezone info; ciso8601 parses the
+            # trailing 'Z' natively
+            return ciso8601.parse_datetime(datetime_str)
+        except (ValueError, TypeError):
             logger.warning(f"Could not parse datetime: {datetime_str}")
             return datetime.now()
     
-    def get_page_summary(self, page_id: str) -> Dict[str, Any]:
+    async def get_page_summary(self, page_id: str) -> Dict[str, Any]:
         """Get a summary of a page without full content.
         
         Args:
@@ -155,7 +202,7 @@ class NotionFetcher:
             Dictionary with page summary information
         """
         try:
-            page_data = self.client.get_page(page_id)
+            page_data = await self.client.get_page(page_id)
             
             return {
                 "id": page_id,
@@ -170,11 +217,14 @@ class NotionFetcher:
             logger.error(f"Failed to get page summary for {page_id}: {e}")
             raise Exception(f"Could not get page summary for {page_id}: {e}")
     
-    def query_database(self, database_id: str, query_params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    async def query_database(self, database_id: str, query_params: Optional[Dict[str, Any]] = None,
+                             limit: Optional[int] = None) -> List[ProcessedPage]:
         """Query a database to get all page records.
         
         Uses the Notion API /databases/{database_id}/query endpoint to retrieve
         all pages in the specified database with optional filtering and sorting.
+        Callers that can handle records one at a time should prefer
+        ``iter_query_database``, which does not hold the whole result set.
         
         Args:
             database_id: The ID of the database to query
@@ -183,9 +233,10 @@ class NotionFetcher:
                          - sorts: Sort criteria for results
                          - page_size: Number of results per page (max 100)
                          - start_cursor: Pagination cursor
+            limit: Stop paginating once this many records have been collected
             
         Returns:
-            List of page records from the database with metadata
+            List of ProcessedPage records from the database
             
         Raises:
             ValueError: If database_id is empty or invalid
@@ -194,9 +245,58 @@ class NotionFetcher:
             
         Example:
             >>> fetcher = NotionFetcher(notion_client)
-            >>> pages = fetcher.query_database("db_123", {"page_size": 50})
+            >>> pages = await fetcher.query_database("db_123", {"page_size": 50})
             >>> for page in pages:
-            ...     print(f"Page: {page['title']} (ID: {page['id']})")
+            ...     print(f"Page: {page.title} (ID: {page.id})")
+        """
+        processed_pages = []
+        async with aclosing(self._iter_query_batches(database_id, query_params)) as batches:
+            async for batch in batches:
+                processed_pages.extend(batch)
+                if limit is not None and len(processed_pages) >= limit:
+                    del processed_pages[limit:]
+                    break
+        
+        logger.info(f"Successfully queried database {database_id}, found {len(processed_pages)} pages")
+        return processed_pages
+    
+    async def iter_query_database(self, database_id: str,
+                                  query_params: Optional[Dict[str, Any]] = None) -> AsyncIterator[ProcessedPage]:
+        """Yield a database's page records as each result page arrives.
+        
+        Only one Notion response is held at a time, and the next one is not
+        requested until the consumer has taken the current records.
+        
+        Args:
+            database_id: The ID of the database to query
+            query_params: Optional query parameters, as for ``query_database``
+            
+        Yields:
+            ProcessedPage records from the database
+            
+        Raises:
+            ValueError: If database_id is empty or invalid
+            ConnectionError: If Notion API connection fails
+            Exception: If database query fails
+        """
+        async with aclosing(self._iter_query_batches(database_id, query_params)) as batches:
+            async for batch in batches:
+                for record in batch:
+                    yield record
+    
+    async def _iter_query_batches(self, database_id: str,
+                                  query_params: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[ProcessedPage]]:
+        """Yield the processed records of each database query response.
+        
+        Args:
+            database_id: The ID of the database to query
+            query_params: Optional query parameters, as for ``query_database``
+            
+        Yields:
+            ProcessedPage records from one Notion response
+            
+        Raises:
+            Same exceptions as ``iter_query_database``
         """
         if not database_id or not database_id.strip():
             raise ValueError("Database ID cannot be empty")
@@ -211,47 +311,42 @@ class NotionFetcher:
                 query_data["page_size"] = 100  # Maximum page size
             
             # Query the database (handle pagination)
-            pages: List[Dict[str, Any]] = []
             start_cursor: Optional[str] = query_data.pop("start_cursor", None)
 
             while True:
-                resp = self.client.client.databases.query(
-                    database_id=database_id,
+                resp = await self.client.query_database(
+                    database_id,
                     start_cursor=start_cursor,
                     **query_data
                 )
-                pages.extend(resp.get("results", []))
+                
+                # Process each page record; failures are logged and skipped
+                # inside _process_database_page
+                yield [
+                    processed_page
+                    for processed_page in map(self._process_database_page, resp.get("results", []))
+                    if processed_page is not None
+                ]
+                
                 if resp.get("has_more") and resp.get("next_cursor"):
                     start_cursor = resp.get("next_cursor")
                 else:
                     break
             
-            # Process each page record
-            processed_pages = []
-            for page in pages:
-                try:
-                    processed_page = self._process_database_page(page)
-                    if processed_page:
-                        processed_pages.append(processed_page)
-                except Exception as e:
-                    logger.warning(f"Failed to process database page {page.get('id', 'unknown')}: {e}")
-                    continue
-            
-            logger.info(f"Successfully queried database {database_id}, found {len(processed_pages)} pages")
-            return processed_pages
-            
         except Exception as e:
             logger.error(f"Database query failed for {database_id}: {e}")
-            if "401" in str(e) or "unauthorized" in str(e).lower():
+            status = api_error_status(e)
+            if status == 401:
                 raise ConnectionError(f"Notion API authentication failed: {e}")
-            elif "403" in str(e) or "forbidden" in str(e).lower():
+            elif status == 403:
                 raise ConnectionError(f"Access forbidden to database {database_id}: {e}")
-            elif "404" in str(e) or "not found" in str(e).lower():
+            elif status == 404:
                 raise ValueError(f"Database {database_id} not found: {e}")
             else:
                 raise Exception(f"Database query failed: {e}")
     
-    def fetch_page_with_blocks(self, page_id: str, include_properties: bool = True) -> Dict[str, Any]:
+    async def fetch_page_with_blocks(self, page_id: str, include_properties: bool = True,
+                                     refresh: bool = False) -> Dict[str, Any]:
         """Fetch a page with all its blocks recursively.
         
         Retrieves a page and recursively fetches all its blocks, including
@@ -260,6 +355,7 @@ class NotionFetcher:
         Args:
             page_id: The ID of the page to fetch
             include_properties: Whether to include page properties
+            refresh: Bypass the Redis cache for the page metadata
             
         Returns:
             Dictionary containing page data and all blocks in a structured format:
@@ -275,7 +371,7 @@ class NotionFetcher:
             
         Example:
             >>> fetcher = NotionFetcher(notion_client)
-            >>> page_data = fetcher.fetch_page_with_blocks("page_123")
+            >>> page_data = await fetcher.fetch_page_with_blocks("page_123")
             >>> print(f"Page: {page_data['page']['title']}")
             >>> print(f"Total blocks: {len(page_data['blocks'])}")
         """
@@ -287,7 +383,7 @@ class NotionFetcher:
         
         try:
             # Fetch basic page information
-            page_data = self.client.get_page(page_id)
+            page_data = await self.client.get_page(page_id, refresh=refresh)
             
             # Extract page metadata
             page_info = {
@@ -304,7 +400,7 @@ class NotionFetcher:
                 properties = self.parser.parse_page_properties(page_data)
             
             # Fetch all blocks recursively
-            all_blocks = self._fetch_blocks_recursively(page_id)
+            all_blocks = await self._fetch_blocks_recursively(page_id)
             
             # Extract text content from all blocks
             content_text = self.parser.extract_text_from_blocks(all_blocks)
@@ -322,21 +418,60 @@ class NotionFetcher:
             
         except Exception as e:
             logger.error(f"Failed to fetch page {page_id} with blocks: {e}")
-            if "401" in str(e) or "unauthorized" in str(e).lower():
+            status = api_error_status(e)
+            if status == 401:
                 raise ConnectionError(f"Notion API authentication failed: {e}")
-            elif "403" in str(e) or "forbidden" in str(e).lower():
+            elif status == 403:
                 raise ConnectionError(f"Access forbidden to page {page_id}: {e}")
-            elif "404" in str(e) or "not found" in str(e).lower():
+            elif status == 404:
                 raise ValueError(f"Page {page_id} not found: {e}")
             else:
                 raise Exception(f"Failed to fetch page with blocks: {e}")
     
-    def _fetch_blocks_recursively(self, block_id: str, max_depth: int = 10) -> List[Dict[str, Any]]:
+    async def fetch_page_with_blocks_cached(self, page_id: str,
+                                      last_edited_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fetch a page with all its blocks, reusing a recent result when possible.
+        
+        Results of ``fetch_page_with_blocks`` are kept for
+        ``settings.cache_ttl_seconds``. When the caller already knows the
+        page's ``last_edited_time`` (e.g. from a search or database query
+        result), a cached entry is only reused if it matches, so edited pages
+        are always re-fetched, with page metadata read from Notion rather than
+        Redis, which could still hold the pre-edit version.
+        
+        Args:
+            page_id: The ID of the page to fetch
+            last_edited_time: Known last edit time of the page, if available
+            
+        Returns:
+            Same structure as ``fetch_page_with_blocks``. The dict is shared
+            with other callers of this method, so it must not be mutated.
+            
+        Raises:
+            Same exceptions as ``fetch_page_with_blocks``
+        """
+        cached = self._page_cache.get(page_id)
+        if cached is not None:
+            cached_edited, page_full = cached
+            if last_edited_time is None or cached_edited == last_edited_time:
+                logger.debug(f"Page cache hit for {page_id}")
+                return page_full
+        
+        page_full = await self.fetch_page_with_blocks(page_id, refresh=last_edited_time is not None)
+        # Key the entry by the caller's edit time when known, so the next
+        # lookup with the same value hits
+        if last_edited_time is None:
+            last_edited_time = page_full["page"]["last_edited_time"]
+        self._page_cache[page_id] = (last_edited_time, page_full)
+        return page_full
+    
+    async def _fetch_blocks_recursively(self, block_id: str, max_depth: int = 10) -> List[Dict[str, Any]]:
         """Recursively fetch all blocks for a given block ID.
         
-        This method handles the recursive nature of Notion blocks, where blocks
-        can have children that also need to be fetched. It implements several
-        safety measures to prevent infinite recursion and handle edge cases.
+        Block children are fetched breadth-first by a small pool of worker
+        tasks, so sibling subtrees are requested concurrently (still bounded
+        by the client's semaphore) instead of one call at a time. The fetched
+        children are then flattened in document (pre-order) order.
         
         Args:
             block_id: The ID of the block to fetch children for
@@ -347,82 +482,89 @@ class NotionFetcher:
             
         Edge Cases Handled:
             - Blocks without children (has_children = false)
-            - Circular references (prevented by max_depth)
+            - Circular references (prevented by max_depth and a visited set)
             - API rate limiting (handled by error catching)
             - Malformed block data (handled by try/catch)
             - Empty or missing block responses
         """
-        all_blocks = []
-        processed_blocks = set()  # Track processed blocks to prevent circular references
-        
-        def _fetch_blocks_recursive(current_block_id: str, current_depth: int = 0):
-            """Internal recursive function for fetching blocks.
-            
-            This nested function handles the actual recursion logic while
-            maintaining access to the outer scope variables.
-            """
-            # Safety check: prevent infinite recursion
-            if current_depth >= max_depth:
-                logger.warning(f"Maximum recursion depth {max_depth} reached for block {current_block_id}")
-                return
-            
-            # Safety check: prevent circular references
-            if current_block_id in processed_blocks:
-                logger.warning(f"Circular reference detected for block {current_block_id}")
-                return
-            
-            processed_blocks.add(current_block_id)
-            
-            try:
-                # Fetch children blocks for the current block with pagination
-                next_cursor: Optional[str] = None
-                while True:
-                    response = self.client.client.blocks.children.list(
-                        block_id=current_block_id,
-                        start_cursor=next_cursor
-                    )
-                    blocks = response.get("results", [])
-
-                    for block in blocks:
-                        try:
-                            # Add the current block to our results
-                            all_blocks.append(block)
-                            
-                            # Check if this block has children and recursively fetch them
-                            if block.get("has_children", False):
-                                child_id = block.get("id")
-                                if child_id:
-                                    # Recursive call with increased depth
-                                    _fetch_blocks_recursive(child_id, current_depth + 1)
-                                else:
-                                    logger.warning("Block has children but missing ID, skipping")
-                        except Exception as e:
-                            logger.warning(f"Failed to process block {block.get('id', 'unknown')}: {e}")
+        # parent block ID -> its direct children, in API order
+        children_by_id: Dict[str, List[Dict[str, Any]]] = {}
+        processed_blocks = {block_id}  # Track queued blocks to prevent circular references
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait((block_id, 0))
+        
+        async def _worker():
+            """Fetch the children of queued blocks and queue their own children."""
+            while True:
+                current_block_id, current_depth = await queue.get()
+                try:
+                    blocks = children_by_id.setdefault(current_block_id, [])
+                    # Fetch children blocks for the current block with pagination
+                    next_cursor: Optional[str] = None
+                    while True:
+                        response = await self.client.list_block_children(
+                            current_block_id,
+                            start_cursor=next_cursor
+                        )
+                        page_blocks = response.get("results", [])
+                        blocks.extend(page_blocks)
+                        
+                        for block in page_blocks:
+                            if not block.get("has_children", False):
+                                continue
+                            child_id = block.get("id")
+                            if not child_id:
+                                logger.warning("Block has children but missing ID, skipping")
+                            elif current_depth + 1 >= max_depth:
+                                logger.warning(f"Maximum recursion depth {max_depth} reached for block {child_id}")
+                            elif child_id in processed_blocks:
+                                logger.warning(f"Circular reference detected for block {child_id}")
+                            else:
+                                processed_blocks.add(child_id)
+                                queue.put_nowait((child_id, current_depth + 1))
+                        # Handle pagination
+                        if response.get("has_more") and response.get("next_cursor"):
+                            next_cursor = response.get("next_cursor")
                             continue
-                    # Handle pagination
-                    if response.get("has_more") and response.get("next_cursor"):
-                        next_cursor = response.get("next_cursor")
-                        continue
-                    break
-            except Exception as e:
-                logger.warning(f"Failed to fetch children for block {current_block_id}: {e}")
-                # Don't re-raise here to allow processing of other blocks
-                return
+                        break
+                except Exception as e:
+                    # Keep what was fetched so far and carry on with other blocks
+                    logger.warning(f"Failed to fetch children for block {current_block_id}: {e}")
+                finally:
+                    queue.task_done()
         
-        # Start the recursive process
-        _fetch_blocks_recursive(block_id)
+        workers = [asyncio.create_task(_worker()) for _ in range(_BLOCK_FETCH_WORKERS)]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Flatten in pre-order: each block is followed by its descendants
+        all_blocks = []
+        stack = [iter(children_by_id.pop(block_id, ()))]
+        while stack:
+            block = next(stack[-1], None)
+            if block is None:
+                stack.pop()
+                continue
+            all_blocks.append(block)
+            children = children_by_id.pop(block.get("id"), None) if block.get("has_children", False) else None
+            if children:
+                stack.append(iter(children))
         
         logger.info(f"Recursively fetched {len(all_blocks)} blocks for block {block_id}")
         return all_blocks
     
-    def _process_database_page(self, page_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _process_database_page(self, page_data: Dict[str, Any]) -> Optional[ProcessedPage]:
         """Process a page record from a database query.
         
         Args:
             page_data: Raw page data from database query
             
         Returns:
-            Processed page data or None if processing fails
+            ProcessedPage or None if processing fails
         """
         try:
             page_id = page_data.get("id")
@@ -439,14 +581,14 @@ class NotionFetcher:
             # Parse properties
             properties = self.parser.parse_page_properties(page_data)
             
-            return {
-                "id": page_id,
-                "title": title,
-                "url": url,
-                "created_time": created_time,
-                "last_edited_time": last_edited_time,
-                "properties": properties
-            }
+            return ProcessedPage(
+                id=page_id,
+                title=title,
+                url=url,
+                created_time=created_time,
+                last_edited_time=last_edited_time,
+                properties=properties
+            )
             
         except Exception as e:
             logger.warning(f"Failed to process database page: {e}")
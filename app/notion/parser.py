@@ -1,23 +1,402 @@
 """Notion content parser for extracting and formatting text."""
 
-from typing import Dict, Any, List, Optional
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Deque, Dict, Any, List, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Element records returned by NotionParser.blocks_to_elements. They serialize
+# with orjson exactly like the equivalent dicts ("type" first), so responses
+# embed them directly; to_dict() is for callers that need a real dict.
+
+@dataclass(slots=True)
+class HeadingEl:
+    """A heading of level 1-3."""
+    
+    type: str = "heading"
+    level: int = 1
+    text: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class ParagraphEl:
+    """A paragraph, or the text of a block without its own element type."""
+    
+    type: str = "paragraph"
+    text: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class ListEl:
+    """A run of bulleted (type "bulleted_list") or numbered ("numbered_list") items."""
+    
+    type: str = "bulleted_list"
+    items: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class TodoItem:
+    """One entry of a TodoListEl."""
+    
+    checked: bool = False
+    text: str = ""
+
+@dataclass(slots=True)
+class TodoListEl:
+    """A run of to-do blocks."""
+    
+    type: str = "todo_list"
+    items: List[TodoItem] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict, items included."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class QuoteEl:
+    """A quote block."""
+    
+    type: str = "quote"
+    text: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class CodeEl:
+    """A code block."""
+    
+    type: str = "code"
+    language: str = ""
+    code: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class DividerEl:
+    """A divider block."""
+    
+    type: str = "divider"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+@dataclass(slots=True)
+class TableEl:
+    """A table, one list of cell texts per row."""
+    
+    type: str = "table"
+    rows: List[List[str]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict."""
+        return asdict(self)
+
+Element = Union[HeadingEl, ParagraphEl, ListEl, TodoListEl, QuoteEl, CodeEl, DividerEl, TableEl]
+
+def extract_rich_text(rich_text: List[Dict[str, Any]]) -> str:
+    """Extract plain text from rich text array.
+    
+    Args:
+        rich_text: List of rich text objects
+    
+    Returns:
+        Concatenated plain text
+    """
+    if not rich_text:
+        return ""
+    # Titles and most blocks are a single unformatted segment
+    if len(rich_text) == 1:
+        return rich_text[0].get("plain_text", "")
+    
+    text_parts = []
+    for text_obj in rich_text:
+        if "plain_text" in text_obj:
+            text_parts.append(text_obj["plain_text"])
+    
+    return "".join(text_parts)
+
+def _rich(block: Dict[str, Any], key: str) -> str:
+    """Extract the plain text of a block's rich_text."""
+    # Avoids building default {} / [] objects for every block
+    data = block.get(key)
+    return extract_rich_text(data["rich_text"]) if data and "rich_text" in data else ""
+
+def _table_text(table_data: Dict[str, Any]) -> str:
+    """Extract text from table data.
+    
+    Args:
+        table_data: Table block data
+    
+    Returns:
+        Formatted table text
+    """
+    # Table blocks themselves do not include row contents; rows usually
+    # arrive as adjacent "table_row" blocks (or in block["children"] if
+    # fetched with children). Callers that want richer tables should use
+    # the higher-level helpers added below which stitch rows together.
+    width = table_data.get("table_width")
+    return f"[Table with {width if width is not None else '?'} columns]"
+
+def _prefixed_text(prefix: str, block_type: str) -> Callable[[Dict[str, Any]], str]:
+    """Build a handler rendering a block's rich text after a fixed prefix."""
+    def handler(block: Dict[str, Any]) -> str:
+        return f"{prefix}{_rich(block, block_type)}"
+    return handler
+
+def _to_do_text(block: Dict[str, Any]) -> str:
+    """Render a to-do block as a checkbox line."""
+    todo_data = block.get("to_do", {})
+    checkbox = "[x]" if todo_data.get("checked", False) else "[ ]"
+    return f"{checkbox} {extract_rich_text(todo_data.get('rich_text', []))}"
+
+def _code_text(block: Dict[str, Any]) -> str:
+    """Render a code block as a fenced code section."""
+    code_data = block.get("code", {})
+    language = code_data.get("language", "")
+    return f"```{language}\n{extract_rich_text(code_data.get('rich_text', []))}\n```"
+
+def _callout_text(block: Dict[str, Any]) -> str:
+    """Render a callout block after its emoji icon."""
+    callout_data = block.get("callout", {})
+    icon = callout_data.get("icon", {}).get("emoji", "💡")
+    return f"{icon} {extract_rich_text(callout_data.get('rich_text', []))}"
+
+# Block type -> single-block text renderer, looked up once per block
+_BLOCK_HANDLERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "paragraph": _prefixed_text("", "paragraph"),
+    "heading_1": _prefixed_text("# ", "heading_1"),
+    "heading_2": _prefixed_text("## ", "heading_2"),
+    "heading_3": _prefixed_text("### ", "heading_3"),
+    "bulleted_list_item": _prefixed_text("• ", "bulleted_list_item"),
+    "numbered_list_item": _prefixed_text("1. ", "numbered_list_item"),
+    "to_do": _to_do_text,
+    "code": _code_text,
+    "quote": _prefixed_text("> ", "quote"),
+    "callout": _callout_text,
+    "divider": lambda block: "---",
+    "table": lambda block: _table_text(block.get("table", {})),
+}
+
+# Signature shared by the block walkers: (blocks, index, lines, elements) ->
+# index of the first block not consumed. A None accumulator skips that output.
+_Walker = Callable[[List[Dict[str, Any]], int, Optional[List[str]], Optional[List[Element]]], int]
+
+def _heading_walker(block_type: str, level: int) -> _Walker:
+    """Build a walker for one heading level."""
+    prefix = f"{'#' * level} "
+    def walk(blocks, i, lines, elements):
+        """Emit a heading block."""
+        text = _rich(blocks[i], block_type)
+        if text:
+            if lines is not None:
+                lines.append(f"{prefix}{text}")
+            if elements is not None:
+                elements.append(HeadingEl(level=level, text=text))
+        return i + 1
+    return walk
+
+def _walk_paragraph(blocks, i, lines, elements):
+    """Emit a paragraph block."""
+    text = _rich(blocks[i], "paragraph")
+    if text:
+        if lines is not None:
+            lines.append(text)
+        if elements is not None:
+            elements.append(ParagraphEl(text=text))
+    return i + 1
+
+def _list_walker(block_type: str, kind: str) -> _Walker:
+    """Build a walker grouping contiguous list items of one kind."""
+    numbered = block_type == "numbered_list_item"
+    def walk(blocks, i, lines, elements):
+        """Emit a run of contiguous list items as one list."""
+        n = len(blocks)
+        items: List[str] = []
+        while i < n and (block := blocks[i]).get("type") == block_type:
+            items.append(_rich(block, block_type))
+            i += 1
+        if lines is not None:
+            if numbered:
+                # Numbering keeps the original positions, empty items included
+                for idx, t in enumerate(items, start=1):
+                    if t:
+                        lines.append(f"{idx}. {t}")
+            else:
+                for t in items:
+                    if t:
+                        lines.append(f"• {t}")
+        if elements is not None:
+            non_empty = [t for t in items if t]
+            if non_empty:
+                elements.append(ListEl(type=kind, items=non_empty))
+        return i
+    return walk
+
+def _walk_to_do(blocks, i, lines, elements):
+    """Emit a run of contiguous to-do blocks as one list."""
+    n = len(blocks)
+    todos: List[TodoItem] = []
+    while i < n and blocks[i].get("type") == "to_do":
+        todo = blocks[i].get("to_do", {})
+        checked = bool(todo.get("checked", False))
+        text = extract_rich_text(todo.get("rich_text", []))
+        if lines is not None:
+            lines.append(f"{'[x]' if checked else '[ ]'} {text}")
+        todos.append(TodoItem(checked=checked, text=text))
+        i += 1
+    if elements is not None:
+        elements.append(TodoListEl(items=todos))
+    return i
+
+def _walk_quote(blocks, i, lines, elements):
+    """Emit a quote block."""
+    text = _rich(blocks[i], "quote")
+    if text:
+        if lines is not None:
+            lines.append(f"> {text}")
+        if elements is not None:
+            elements.append(QuoteEl(text=text))
+    return i + 1
+
+def _walk_code(blocks, i, lines, elements):
+    """Emit a code block."""
+    code = blocks[i].get("code", {})
+    language = code.get("language", "")
+    text = extract_rich_text(code.get("rich_text", []))
+    if lines is not None:
+        lines.append(f"```{language}\n{text}\n```")
+    if elements is not None:
+        elements.append(CodeEl(language=language, code=text))
+    return i + 1
+
+def _walk_divider(blocks, i, lines, elements):
+    """Emit a divider block."""
+    if lines is not None:
+        lines.append("---")
+    if elements is not None:
+        elements.append(DividerEl())
+    return i + 1
+
+def _walk_table(blocks, i, lines, elements):
+    """Emit a table block and the table_row blocks following it."""
+    # Consume the following contiguous table_row blocks. If no rows are
+    # available, fall back to a compact descriptor.
+    n = len(blocks)
+    rows: List[List[str]] = []
+    j = i + 1
+    while j < n and blocks[j].get("type") == "table_row":
+        cells = blocks[j].get("table_row", {}).get("cells", [])
+        # each cell is a list of rich_text objects
+        rows.append([extract_rich_text(cell) for cell in cells])
+        j += 1
+    
+    if rows:
+        if lines is not None:
+            # Render header separator after the first row
+            header = rows[0]
+            lines.append(f"| {' | '.join(header)} |")
+            lines.append(f"|{'|'.join(['---'] * len(header))}|")
+            for r in rows[1:]:
+                lines.append(f"| {' | '.join(r)} |")
+        next_i = j
+    else:
+        if lines is not None:
+            lines.append(_table_text(blocks[i].get("table", {})))
+        next_i = i + 1
+    if elements is not None:
+        elements.append(TableEl(rows=rows))
+    return next_i
+
+def _walk_table_row(blocks, i, lines, elements):
+    """Emit a table_row block that has no preceding table."""
+    # Isolated row without a preceding table: a CSV line in text, a
+    # single-row table in elements
+    cells = blocks[i].get("table_row", {}).get("cells", [])
+    row = [extract_rich_text(cell) for cell in cells]
+    if lines is not None:
+        lines.append(", ".join(row))
+    if elements is not None:
+        elements.append(TableEl(rows=[row]))
+    return i + 1
+
+# Block type -> walker used by NotionParser.parse_both; other blocks fall
+# back to their children or to _BLOCK_HANDLERS
+_BLOCK_WALKERS: Dict[str, _Walker] = {
+    "heading_1": _heading_walker("heading_1", 1),
+    "heading_2": _heading_walker("heading_2", 2),
+    "heading_3": _heading_walker("heading_3", 3),
+    "paragraph": _walk_paragraph,
+    "bulleted_list_item": _list_walker("bulleted_list_item", "bulleted_list"),
+    "numbered_list_item": _list_walker("numbered_list_item", "numbered_list"),
+    "to_do": _walk_to_do,
+    "quote": _walk_quote,
+    "code": _walk_code,
+    "divider": _walk_divider,
+    "table": _walk_table,
+    "table_row": _walk_table_row,
+}
+
+def _select_value(prop_data: Dict[str, Any]) -> Any:
+    """Parse a select property to its option name."""
+    select_data = prop_data.get("select", {})
+    return select_data.get("name") if select_data else None
+
+def _date_value(prop_data: Dict[str, Any]) -> Any:
+    """Parse a date property to its start date."""
+    date_data = prop_data.get("date", {})
+    return date_data.get("start") if date_data else None
+
+# Property type -> value parser; unknown types keep their raw data
+_PROPERTY_PARSERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "title": lambda prop_data: extract_rich_text(prop_data.get("title", [])),
+    "rich_text": lambda prop_data: extract_rich_text(prop_data.get("rich_text", [])),
+    "select": _select_value,
+    "multi_select": lambda prop_data: [item.get("name") for item in prop_data.get("multi_select", [])],
+    "date": _date_value,
+    "checkbox": lambda prop_data: prop_data.get("checkbox", False),
+    "number": lambda prop_data: prop_data.get("number"),
+    "url": lambda prop_data: prop_data.get("url"),
+    "email": lambda prop_data: prop_data.get("email"),
+    "phone_number": lambda prop_data: prop_data.get("phone_number"),
+}
+
 class NotionParser:
-    """Parser for Notion content blocks and pages."""
+    """Parser for Notion content blocks and pages.
+    
+    The parser is stateless; use the shared ``default_parser`` instance.
+    """
+    
+    # No per-instance state, so instances carry no __dict__
+    __slots__ = ()
     
     def __init__(self):
         """Initialize the parser."""
         pass
     
+    extract_rich_text = staticmethod(extract_rich_text)
+    
     def extract_text_from_blocks(self, blocks: List[Dict[str, Any]]) -> str:
         """Extract plain text from Notion blocks.
         
         Args:
             blocks: List of Notion block objects
-            
+        
         Returns:
             Concatenated plain text content
         """
@@ -35,58 +414,13 @@ class NotionParser:
         
         Args:
             block: Single Notion block object
-            
+        
         Returns:
             Extracted text or None if no text content
         """
-        block_type = block.get("type", "")
-        
-        # Handle different block types
-        if block_type == "paragraph":
-            return self._extract_rich_text(block.get("paragraph", {}).get("rich_text", []))
-        
-        elif block_type == "heading_1":
-            return f"# {self._extract_rich_text(block.get('heading_1', {}).get('rich_text', []))}"
-        
-        elif block_type == "heading_2":
-            return f"## {self._extract_rich_text(block.get('heading_2', {}).get('rich_text', []))}"
-        
-        elif block_type == "heading_3":
-            return f"### {self._extract_rich_text(block.get('heading_3', {}).get('rich_text', []))}"
-        
-        elif block_type == "bulleted_list_item":
-            return f"• {self._extract_rich_text(block.get('bulleted_list_item', {}).get('rich_text', []))}"
-        
-        elif block_type == "numbered_list_item":
-            return f"1. {self._extract_rich_text(block.get('numbered_list_item', {}).get('rich_text', []))}"
-        
-        elif block_type == "to_do":
-            todo_data = block.get("to_do", {})
-            checked = todo_data.get("checked", False)
-            text = self._extract_rich_text(todo_data.get("rich_text", []))
-            checkbox = "[x]" if checked else "[ ]"
-            return f"{checkbox} {text}"
-        
-        elif block_type == "code":
-            code_data = block.get("code", {})
-            language = code_data.get("language", "")
-            text = self._extract_rich_text(code_data.get("rich_text", []))
-            return f"```{language}\n{text}\n```"
-        
-        elif block_type == "quote":
-            return f"> {self._extract_rich_text(block.get('quote', {}).get('rich_text', []))}"
-        
-        elif block_type == "callout":
-            callout_data = block.get("callout", {})
-            icon = callout_data.get("icon", {}).get("emoji", "💡")
-            text = self._extract_rich_text(callout_data.get("rich_text", []))
-            return f"{icon} {text}"
-        
-        elif block_type == "divider":
-            return "---"
-        
-        elif block_type == "table":
-            return self._extract_table_text(block.get("table", {}))
+        handler = _BLOCK_HANDLERS.get(block.get("type", ""))
+        if handler is not None:
+            return handler(block)
         
         # Handle child blocks recursively
         if "children" in block:
@@ -96,95 +430,23 @@ class NotionParser:
         
         return None
     
-    def _extract_rich_text(self, rich_text: List[Dict[str, Any]]) -> str:
-        """Extract plain text from rich text array.
-        
-        Args:
-            rich_text: List of rich text objects
-            
-        Returns:
-            Concatenated plain text
-        """
-        if not rich_text:
-            return ""
-        
-        text_parts = []
-        for text_obj in rich_text:
-            if "plain_text" in text_obj:
-                text_parts.append(text_obj["plain_text"])
-        
-        return "".join(text_parts)
-    
-    def _extract_table_text(self, table_data: Dict[str, Any]) -> str:
-        """Extract text from table data.
-        
-        Args:
-            table_data: Table block data
-            
-        Returns:
-            Formatted table text
-        """
-        # Table blocks themselves do not include row contents; rows usually
-        # arrive as adjacent "table_row" blocks (or in block["children"] if
-        # fetched with children). Callers that want richer tables should use
-        # the higher-level helpers added below which stitch rows together.
-        width = table_data.get("table_width")
-        return f"[Table with {width if width is not None else '?'} columns]"
-    
     def parse_page_properties(self, page: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and parse page properties.
         
         Args:
             page: Notion page object
-            
+        
         Returns:
             Dictionary of parsed properties
         """
         properties = {}
-        page_properties = page.get("properties", {})
         
-        for prop_name, prop_data in page_properties.items():
-            prop_type = prop_data.get("type", "")
-            
-            if prop_type == "title":
-                properties[prop_name] = self._extract_rich_text(prop_data.get("title", []))
-            
-            elif prop_type == "rich_text":
-                properties[prop_name] = self._extract_rich_text(prop_data.get("rich_text", []))
-            
-            elif prop_type == "select":
-                select_data = prop_data.get("select", {})
-                properties[prop_name] = select_data.get("name") if select_data else None
-            
-            elif prop_type == "multi_select":
-                multi_select_data = prop_data.get("multi_select", [])
-                properties[prop_name] = [item.get("name") for item in multi_select_data]
-            
-            elif prop_type == "date":
-                date_data = prop_data.get("date", {})
-                properties[prop_name] = date_data.get("start") if date_data else None
-            
-            elif prop_type == "checkbox":
-                properties[prop_name] = prop_data.get("checkbox", False)
-            
-            elif prop_type == "number":
-                properties[prop_name] = prop_data.get("number")
-            
-            elif prop_type == "url":
-                properties[prop_name] = prop_data.get("url")
-            
-            elif prop_type == "email":
-                properties[prop_name] = prop_data.get("email")
-            
-            elif prop_type == "phone_number":
-                properties[prop_name] = prop_data.get("phone_number")
-            
-            else:
-                # For unknown property types, store the raw data
-                properties[prop_name] = prop_data
+        for prop_name, prop_data in page.get("properties", {}).items():
+            parse = _PROPERTY_PARSERS.get(prop_data.get("type", ""))
+            properties[prop_name] = parse(prop_data) if parse is not None else prop_data
         
         return properties
-
+    
     def flatten_blocks_to_text(self, blocks: List[Dict[str, Any]]) -> str:
         """Convert a recursive block tree into a readable plain-text string.
         
@@ -207,140 +469,15 @@ class NotionParser:
             text = parser.flatten_blocks_to_text(blocks)
             # => "# Title\nParagraph...\n• Item 1\n• Item 2\n---\n| Col A | Col B |\n|---|---|\n| v1 | v2 |"
         """
-        lines: List[str] = []
-
-        i = 0
-        n = len(blocks)
-
-        def rich(block: Dict[str, Any], key: str) -> str:
-            return self._extract_rich_text(block.get(key, {}).get("rich_text", []))
-
-        while i < n:
-            block = blocks[i]
-            btype = block.get("type", "")
-
-            if btype in ("heading_1", "heading_2", "heading_3"):
-                level = {"heading_1": 1, "heading_2": 2, "heading_3": 3}[btype]
-                text = rich(block, btype)
-                if text:
-                    lines.append(f"{'#' * level} {text}")
-                i += 1
-                continue
-
-            if btype == "paragraph":
-                text = rich(block, "paragraph")
-                if text:
-                    lines.append(text)
-                i += 1
-                continue
-
-            if btype in ("bulleted_list_item", "numbered_list_item"):
-                # Group contiguous list items of the same kind
-                items: List[str] = []
-                start = i
-                while i < n and blocks[i].get("type") == btype:
-                    items.append(self._extract_rich_text(blocks[i][btype].get("rich_text", [])))
-                    i += 1
-                if btype == "bulleted_list_item":
-                    for t in items:
-                        if t:
-                            lines.append(f"• {t}")
-                else:
-                    for idx, t in enumerate(items, start=1):
-                        if t:
-                            lines.append(f"{idx}. {t}")
-                continue
-
-            if btype == "to_do":
-                todo = block.get("to_do", {})
-                checked = todo.get("checked", False)
-                text = self._extract_rich_text(todo.get("rich_text", []))
-                checkbox = "[x]" if checked else "[ ]"
-                lines.append(f"{checkbox} {text}")
-                i += 1
-                continue
-
-            if btype == "quote":
-                text = rich(block, "quote")
-                if text:
-                    lines.append(f"> {text}")
-                i += 1
-                continue
-
-            if btype == "code":
-                code = block.get("code", {})
-                language = code.get("language", "")
-                text = self._extract_rich_text(code.get("rich_text", []))
-                lines.append(f"```{language}\n{text}\n```")
-                i += 1
-                continue
-
-            if btype == "divider":
-                lines.append("---")
-                i += 1
-                continue
-
-            if btype == "table":
-                # Build a simple Markdown-like table by consuming following
-                # contiguous table_row blocks. If no rows are available,
-                # fall back to a compact descriptor.
-                table = block.get("table", {})
-                rows: List[List[str]] = []
-
-                j = i + 1
-                while j < n and blocks[j].get("type") == "table_row":
-                    cells = blocks[j].get("table_row", {}).get("cells", [])
-                    row_texts: List[str] = []
-                    for cell in cells:
-                        # cell is a list of rich_text objects
-                        row_texts.append(self._extract_rich_text(cell))
-                    rows.append(row_texts)
-                    j += 1
-
-                if rows:
-                    # Render header separator after the first row
-                    header = rows[0]
-                    lines.append("| " + " | ".join(header) + " |")
-                    lines.append("|" + "|".join(["---" for _ in header]) + "|")
-                    for r in rows[1:]:
-                        lines.append("| " + " | ".join(r) + " |")
-                    i = j
-                    continue
-                else:
-                    lines.append(self._extract_table_text(table))
-                    i += 1
-                    continue
-
-            if btype == "table_row":
-                # If we see an isolated row (without a preceding table), render as CSV line
-                cells = block.get("table_row", {}).get("cells", [])
-                row_texts = [self._extract_rich_text(cell) for cell in cells]
-                lines.append(", ".join(row_texts))
-                i += 1
-                continue
-
-            # If nested children were provided, render them recursively
-            if "children" in block and isinstance(block["children"], list):
-                child_text = self.flatten_blocks_to_text(block["children"])
-                if child_text:
-                    lines.append(child_text)
-                i += 1
-                continue
-
-            # Fallback to existing single-block extractor
-            fallback = self._extract_text_from_block(block)
-            if fallback:
-                lines.append(fallback)
-            i += 1
-
-        text = "\n".join(lines)
-        return self.sanitize_text(text)
-
-    def blocks_to_elements(self, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        text, _ = self.parse_both(blocks, include_elements=False)
+        return text
+    
+    def blocks_to_elements(self, blocks: List[Dict[str, Any]]) -> List[Element]:
         """Convert blocks into a lightweight JSON array for LLM analysis.
         
-        Returns a list of dictionaries. Each dictionary has a mandatory
-        "type" field and additional fields depending on type:
+        Returns a list of slotted element records (HeadingEl, ParagraphEl,
+        ...). Each serializes with orjson as below, or via ``to_dict()``, with
+        a mandatory "type" field and additional fields depending on type:
         - heading: {"type":"heading","level":1|2|3,"text":str}
         - paragraph: {"type":"paragraph","text":str}
         - bulleted_list: {"type":"bulleted_list","items":[str]}
@@ -354,121 +491,94 @@ class NotionParser:
         Example:
             elements = parser.blocks_to_elements(blocks)
             # => [
-            #   {"type":"heading","level":1,"text":"Title"},
-            #   {"type":"paragraph","text":"Intro paragraph"},
-            #   {"type":"bulleted_list","items":["Item 1","Item 2"]}
+            #   HeadingEl(type="heading", level=1, text="Title"),
+            #   ParagraphEl(type="paragraph", text="Intro paragraph"),
+            #   ListEl(type="bulleted_list", items=["Item 1", "Item 2"])
             # ]
         """
-        elements: List[Dict[str, Any]] = []
-
-        i = 0
-        n = len(blocks)
-
-        def rich(block: Dict[str, Any], key: str) -> str:
-            return self._extract_rich_text(block.get(key, {}).get("rich_text", []))
-
-        while i < n:
-            block = blocks[i]
-            btype = block.get("type", "")
-
-            if btype in ("heading_1", "heading_2", "heading_3"):
-                level = {"heading_1": 1, "heading_2": 2, "heading_3": 3}[btype]
-                text = rich(block, btype)
-                if text:
-                    elements.append({"type": "heading", "level": level, "text": text})
-                i += 1
-                continue
-
-            if btype == "paragraph":
-                text = rich(block, "paragraph")
-                if text:
-                    elements.append({"type": "paragraph", "text": text})
-                i += 1
-                continue
-
-            if btype in ("bulleted_list_item", "numbered_list_item"):
-                items: List[str] = []
-                kind = "bulleted_list" if btype == "bulleted_list_item" else "numbered_list"
-                while i < n and blocks[i].get("type") == btype:
-                    items.append(self._extract_rich_text(blocks[i][btype].get("rich_text", [])))
-                    i += 1
-                items = [t for t in items if t]
-                if items:
-                    elements.append({"type": kind, "items": items})
-                continue
-
-            if btype == "to_do":
-                todos: List[Dict[str, Any]] = []
-                while i < n and blocks[i].get("type") == "to_do":
-                    todo = blocks[i].get("to_do", {})
-                    todos.append({
-                        "checked": bool(todo.get("checked", False)),
-                        "text": self._extract_rich_text(todo.get("rich_text", []))
-                    })
-                    i += 1
-                if todos:
-                    elements.append({"type": "todo_list", "items": todos})
-                continue
-
-            if btype == "quote":
-                text = rich(block, "quote")
-                if text:
-                    elements.append({"type": "quote", "text": text})
-                i += 1
-                continue
-
-            if btype == "code":
-                code = block.get("code", {})
-                language = code.get("language", "")
-                text = self._extract_rich_text(code.get("rich_text", []))
-                elements.append({"type": "code", "language": language, "code": text})
-                i += 1
-                continue
-
-            if btype == "divider":
-                elements.append({"type": "divider"})
-                i += 1
-                continue
-
-            if btype == "table":
-                rows: List[List[str]] = []
-                j = i + 1
-                while j < n and blocks[j].get("type") == "table_row":
-                    cells = blocks[j].get("table_row", {}).get("cells", [])
-                    rows.append([self._extract_rich_text(cell) for cell in cells])
-                    j += 1
-                if rows:
-                    elements.append({"type": "table", "rows": rows})
-                    i = j
-                    continue
-                else:
-                    elements.append({"type": "table", "rows": []})
-                    i += 1
+        _, elements = self.parse_both(blocks, include_text=False)
+        return elements
+    
+    def parse_both(
+        self,
+        blocks: List[Dict[str, Any]],
+        include_text: bool = True,
+        include_elements: bool = True
+    ) -> Tuple[str, List[Element]]:
+        """Render blocks as plain text and structured elements in one pass.
+        
+        Produces exactly what flatten_blocks_to_text and blocks_to_elements
+        return, but walks the block tree only once.
+        
+        Args:
+            blocks: List of Notion block objects
+            include_text: Whether to build the plain-text rendering
+            include_elements: Whether to build the elements list
+        
+        Returns:
+            Tuple of (text, elements); a disabled output is "" or []
+        """
+        lines: Optional[List[str]] = [] if include_text else None
+        elements: Optional[List[Element]] = [] if include_elements else None
+        self._walk_blocks(blocks, lines, elements)
+        text = self.sanitize_text("\n".join(lines)) if lines is not None else ""
+        return text, elements if elements is not None else []
+    
+    def _walk_blocks(
+        self,
+        blocks: List[Dict[str, Any]],
+        lines: Optional[List[str]],
+        elements: Optional[List[Element]]
+    ) -> None:
+        """Append the text lines and elements for a block list.
+        
+        Nested children are walked with an explicit stack of frames rather
+        than recursion, so deep block trees cannot hit the recursion limit.
+        
+        Args:
+            blocks: List of Notion block objects
+            lines: Text accumulator, or None to skip text output
+            elements: Elements accumulator, or None to skip element output
+        """
+        # Frames of (blocks, index to resume at, text accumulator). A child
+        # frame sits directly above the frame of the block that owns it.
+        stack: Deque[Tuple[List[Dict[str, Any]], int, Optional[List[str]]]] = deque([(blocks, 0, lines)])
+        while stack:
+            blocks, i, lines = stack.pop()
+            n = len(blocks)
+            while i < n:
+                block = blocks[i]
+                btype = block.get("type", "")
+                
+                walker = _BLOCK_WALKERS.get(btype)
+                if walker is not None:
+                    i = walker(blocks, i, lines, elements)
                     continue
-
-            if btype == "table_row":
-                # Standalone row: represent as single-row table
-                cells = block.get("table_row", {}).get("cells", [])
-                row = [self._extract_rich_text(cell) for cell in cells]
-                elements.append({"type": "table", "rows": [row]})
-                i += 1
-                continue
-
-            # Children (nested) handling: convert recursively and extend
-            if "children" in block and isinstance(block["children"], list):
-                child_elements = self.blocks_to_elements(block["children"])
-                elements.extend(child_elements)
+                
+                # If nested children were provided, walk them before moving on
+                if "children" in block and isinstance(block["children"], list):
+                    stack.append((blocks, i + 1, lines))
+                    stack.append((block["children"], 0, [] if lines is not None else None))
+                    break
+                
+                # Fallback to the single-block renderers (callouts etc.), reusing
+                # the type already read; _extract_text_from_block handles the rest
+                handler = _BLOCK_HANDLERS.get(btype)
+                fallback = handler(block) if handler is not None else self._extract_text_from_block(block)
+                if fallback:
+                    if lines is not None:
+                        lines.append(fallback)
+                    if elements is not None:
+                        elements.append(ParagraphEl(text=fallback))
                 i += 1
-                continue
-
-            # Fallback: use text extractor as paragraph if anything was found
-            fallback = self._extract_text_from_block(block)
-            if fallback:
-                elements.append({"type": "paragraph", "text": fallback})
-            i += 1
-
-        return elements
-
+            else:
+                # Children are sanitized as their own section before joining
+                # the lines of the frame that owns them
+                if stack and lines is not None:
+                    child_text = self.sanitize_text("\n".join(lines))
+                    if child_text:
+                        stack[-1][2].append(child_text)
+    
     def sanitize_text(self, text: str) -> str:
         """Normalize text for LLM consumption.
         
@@ -479,7 +589,8 @@ class NotionParser:
         """
         if not text:
             return ""
-        # Replace NBSP and similar
+        # Replace NBSP and similar. Each replace is a fast scan when the
+        # character is absent, which beats str.translate on ASCII text.
         cleaned = (
             text
             .replace("\u00a0", " ")  # non-breaking space
@@ -489,9 +600,24 @@ class NotionParser:
         )
         # Normalize line endings
         cleaned = cleaned.replace("\r\n", "\n").replace("\r", "\n")
-        # Trim trailing spaces per line
-        cleaned = "\n".join(line.rstrip() for line in cleaned.split("\n"))
-        # Collapse excessive blank lines
-        while "\n\n\n" in cleaned:
-            cleaned = cleaned.replace("\n\n\n", "\n\n")
-        return cleaned
+        # Trim trailing spaces per line and collapse excessive blank lines in
+        # one pass: one blank line is kept between lines, two at either end
+        out: List[str] = []
+        blanks = 0
+        for line in cleaned.split("\n"):
+            line = line.rstrip()
+            if not line:
+                blanks += 1
+                continue
+            if blanks:
+                out.extend([""] * min(blanks, 1 if out else 2))
+                blanks = 0
+            out.append(line)
+        if blanks:
+            # A text of only blank lines keeps at most three (two newlines)
+            out.extend([""] * min(blanks, 2 if out else 3))
+        return "\n".join(out)
+
+# The parser is stateless, so one instance is shared by the fetcher,
+# searcher and endpoints
+default_parser = NotionParser()
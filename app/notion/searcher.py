@@ -1,15 +1,27 @@
 """Notion content searcher for finding relevant pages."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
+import heapq
 import logging
 from datetime import datetime
+from operator import itemgetter
+
+import ciso8601
+from cachetools import TTLCache
 
 from .client import NotionClient
-from .parser import NotionParser
+from .errors import api_error_status
+from .parser import default_parser
 from ..models.schema import NotionPage, SearchQuery, SearchResponse
 
 logger = logging.getLogger(__name__)
 
+# Notion search sort returning the most recently edited objects first
+_RECENT_FIRST = {"direction": "descending", "timestamp": "last_edited_time"}
+
+# How long search_pages_and_databases results are reused for a repeated query
+_SEARCH_CACHE_SECONDS = 30
+
 class NotionSearcher:
     """Searcher for finding relevant Notion pages."""
     
@@ -20,82 +32,87 @@ class NotionSearcher:
             notion_client: Initialized Notion client
         """
         self.client = notion_client
-        self.parser = NotionParser()
+        self.parser = default_parser
+        # (query, max_results, kind) -> search_pages_and_databases result
+        self._search_cache: TTLCache = TTLCache(maxsize=256, ttl=_SEARCH_CACHE_SECONDS)
+        # parent database ID ("__root__" for other parents) -> title property name;
+        # re-learned whenever the cached name no longer holds the title
+        self._title_prop_by_parent: Dict[str, str] = {}
     
-    def search_pages(self, search_query: SearchQuery) -> SearchResponse:
+    async def search_pages(self, search_query: SearchQuery) -> SearchResponse:
         """Search for pages matching the query.
         
         Args:
             search_query: Search query parameters
-            
+        
         Returns:
             SearchResponse with matching pages
-            
+        
         Raises:
             Exception: If search fails
         """
         try:
             # Perform the search
-            search_results = self.client.search_pages(
+            search_results = await self.client.search_pages(
                 query=search_query.query,
                 filter_properties=search_query.filter_properties
             )
             
             # Process results
-            pages = []
-            results = search_results.get("results", [])
+            pages = self._process_search_results(search_results.get("results", [])[:search_query.max_results])
             
-            for result in results[:search_query.max_results]:
-                try:
-                    page = self._process_search_result(result)
-                    if page:
-                        pages.append(page)
-                except Exception as e:
-                    logger.warning(f"Failed to process search result: {e}")
-                    continue
-            
-            return SearchResponse(
+            return SearchResponse.model_construct(
                 results=pages,
                 total_count=len(pages),
                 query=search_query.query
             )
-            
+        
         except Exception as e:
             logger.error(f"Search failed for query '{search_query.query}': {e}")
             raise Exception(f"Search failed: {e}")
     
-    def search_by_database(self, database_id: str, search_query: SearchQuery) -> SearchResponse:
+    async def search_by_database(self, database_id: str, search_query: SearchQuery) -> SearchResponse:
         """Search for pages within a specific database.
         
         Args:
             database_id: ID of the database to search
             search_query: Search query parameters
-            
+        
         Returns:
             SearchResponse with matching pages from the database
-            
+        
         Raises:
             Exception: If search fails
         """
         try:
-            # Add database filter to search
-            if search_query.filter_properties is None:
-                search_query.filter_properties = {}
-            
-            search_query.filter_properties["database_id"] = database_id
-            
-            return self.search_pages(search_query)
+            # Add database filter to a copy, leaving the caller's query untouched
+            database_query = search_query.model_copy(update={
+                "filter_properties": {**(search_query.filter_properties or {}), "database_id": database_id}
+            })
             
+            return await self.search_pages(database_query)
+        
         except Exception as e:
             logger.error(f"Database search failed for database {database_id}: {e}")
             raise Exception(f"Database search failed: {e}")
     
+    def _process_search_results(self, results: List[Dict[str, Any]]) -> List[NotionPage]:
+        """Process search results into NotionPages, skipping any that fail.
+        
+        Args:
+            results: Search results from Notion API
+        
+        Returns:
+            NotionPage objects, in the order of the results
+        """
+        return [page for page in map(self._process_search_result, results) if page is not None]
+    
     def _process_search_result(self, result: Dict[str, Any]) -> Optional[NotionPage]:
         """Process a single search result into a NotionPage.
         
         Args:
             result: Single search result from Notion API
-            
+        
         Returns:
             NotionPage object or None if processing fails
         """
@@ -105,7 +122,7 @@ class NotionSearcher:
                 return None
             
             # Extract basic information
-            title = self._extract_title_from_result(result)
+            title = self._extract_title(result)
             url = result.get("url", "")
             created_time = self._parse_datetime(result.get("created_time"))
             last_edited_time = self._parse_datetime(result.get("last_edited_time"))
@@ -126,102 +143,138 @@ class NotionSearcher:
                 last_edited_time=last_edited_time,
                 properties=properties
             )
-            
+        
         except Exception as e:
             logger.warning(f"Failed to process search result: {e}")
             return None
     
-    def _extract_title_from_result(self, result: Dict[str, Any]) -> str:
-        """Extract title from search result.
+    def _extract_title(self, result: Dict[str, Any], object_type: str = "page") -> str:
+        """Extract title from search result based on object type.
         
         Args:
-            result: Search result data
-            
+            result: Search result from Notion API
+            object_type: Type of object ('page' or 'database')
+        
         Returns:
-            Page title or fallback
+            Extracted title or fallback
+        """
+        if object_type == "page":
+            # For pages, look in properties for title
+            title = self._page_title(result)
+        elif object_type == "database":
+            # For databases, title is in the title array
+            title = self.parser.extract_rich_text(result.get("title", []))
+        else:
+            title = None
+        if title:
+            return title
+        
+        # Fallback to object ID if no title found
+        return f"Untitled {object_type.title()} ({result.get('id', 'unknown')})"
+    
+    def _page_title(self, result: Dict[str, Any]) -> Optional[str]:
+        """Find the text of a page's title property.
+        
+        Args:
+            result: Page object from the Notion API
+        
+        Returns:
+            The title, or None if the page has no non-empty title property
         """
         properties = result.get("properties", {})
+        parent_key = (result.get("parent") or {}).get("database_id") or "__root__"
+        
+        # Pages sharing a parent database share its title property, so try
+        # the name found last time before scanning every property
+        prop_name = self._title_prop_by_parent.get(parent_key)
+        if prop_name is not None:
+            prop_data = properties.get(prop_name)
+            if prop_data and prop_data.get("type") == "title":
+                title = self.parser.extract_rich_text(prop_data.get("title", []))
+                if title:
+                    return title
         
         # Look for title property
         for prop_name, prop_data in properties.items():
             if prop_data.get("type") == "title":
+                self._title_prop_by_parent[parent_key] = prop_name
                 title_rich_text = prop_data.get("title", [])
-                title = self.parser._extract_rich_text(title_rich_text)
+                title = self.parser.extract_rich_text(title_rich_text)
                 if title:
                     return title
         
-        # Fallback to page ID if no title found
-        return f"Untitled Page ({result.get('id', 'unknown')})"
+        return None
     
-    def _parse_datetime(self, datetime_str: Optional[str]) -> 'datetime':
+    def _parse_datetime(self, datetime_str: Optional[str]) -> datetime:
         """Parse datetime string from Notion API.
         
         Args:
             datetime_str: ISO datetime string from Notion
-            
+        
         Returns:
             Parsed datetime object or current time as fallback
         """
-        from datetime import datetime
-        
         if not datetime_str:
             return datetime.now()
         
         try:
-            # Notion uses ISO format with timezone info
-            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
+            # Notion uses ISO format with timezone info; ciso8601 parses the
+            # trailing 'Z' natively
+            return ciso8601.parse_datetime(datetime_str)
+        except (ValueError, TypeError):
             logger.warning(f"Could not parse datetime: {datetime_str}")
             return datetime.now()
     
-    def get_recent_pages(self, max_results: int = 10) -> SearchResponse:
+    async def get_recent_pages(self, max_results: int = 10) -> SearchResponse:
         """Get recently edited pages.
         
         Args:
             max_results: Maximum number of pages to return
-            
+        
         Returns:
             SearchResponse with recent pages
         """
         try:
-            # Search with empty query to get recent pages
-            search_results = self.client.search_pages(query="")
-            
-            # Sort by last edited time (most recent first)
-            results = search_results.get("results", [])
-            results.sort(
-                key=lambda x: x.get("last_edited_time", ""),
-                reverse=True
+            # Search with empty query to get recent pages, letting Notion sort
+            # them (most recently edited first) and return only what is needed
+            search_results = await self.client.search_pages(
+                query="",
+                sort=_RECENT_FIRST,
+                page_size=max(1, min(100, max_results))
             )
             
             # Process results
-            pages = []
-            for result in results[:max_results]:
-                page = self._process_search_result(result)
-                if page:
-                    pages.append(page)
+            pages = self._process_search_results(search_results.get("results", [])[:max_results])
             
-            return SearchResponse(
+            return SearchResponse.model_construct(
                 results=pages,
                 total_count=len(pages),
                 query="recent pages"
             )
-            
+        
         except Exception as e:
             logger.error(f"Failed to get recent pages: {e}")
             raise Exception(f"Could not get recent pages: {e}")
     
-    def search_pages_and_databases(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def search_pages_and_databases(
+        self,
+        query: str,
+        max_results: int = 20,
+        kind: Optional[Literal["page", "database"]] = None
+    ) -> List[Dict[str, Any]]:
         """Search for both pages and databases matching the query.
         
         This function performs a comprehensive search across both pages and databases
         in the Notion workspace, filtering by object type and matching against titles.
-        Results are sorted by last_edited_time (most recent first).
+        Results are sorted by last_edited_time (most recent first). Results
+        for a repeated query are reused for ``_SEARCH_CACHE_SECONDS``.
         
         Args:
             query: Search query string (e.g., 'Company A financial logs September')
             max_results: Maximum number of results to return (default: 20)
-            
+            kind: Restrict the search to 'page' or 'database' objects; both
+                are searched when omitted
+        
         Returns:
             List of metadata dictionaries containing:
             - id: Notion object ID
@@ -230,15 +283,15 @@ class NotionSearcher:
             - last_edited: Last edited timestamp
             - url: Notion URL
             - created_time: Creation timestamp
-            
+        
         Raises:
             ValueError: If query is empty or invalid
             ConnectionError: If Notion API connection fails
             Exception: If search operation fails
-            
+        
         Example:
             >>> searcher = NotionSearcher(notion_client)
-            >>> results = searcher.search_pages_and_databases("Company A financial logs September")
+            >>> results = await searcher.search_pages_and_databases("Company A financial logs September")
             >>> for result in results:
             ...     print(f"{result['object_type']}: {result['title']} (edited: {result['last_edited']})")
         """
@@ -246,74 +299,91 @@ class NotionSearcher:
             raise ValueError("Query string cannot be empty")
         
         query = query.strip()
+        cache_key = (query, max_results, kind)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for query: '{query}'")
+            # Callers may mutate the result dicts, so hand out copies
+            return [dict(r) for r in cached]
+        
         logger.info(f"Searching for pages and databases with query: '{query}'")
         
         try:
-            # Perform search with filter for both pages and databases
-            search_results = self.client.client.search(
-                query=query,
-                filter={
-                    "property": "object",
-                    "value": "page"
-                },
-                page_size=100  # Get more results to filter and sort
-            )
-            
-            # Also search for databases
-            database_results = self.client.client.search(
-                query=query,
-                filter={
-                    "property": "object", 
-                    "value": "database"
-                },
-                page_size=100
-            )
+            # Without a kind, one unfiltered search returns pages and databases
+            # together; each result's "object" field tells them apart
+            results = await self._paginated_search(query, kind, max_results)
             
-            # Combine and process results
             all_results = []
-            
-            # Process page results
-            page_results = search_results.get("results", [])
-            for result in page_results:
-                metadata = self._extract_metadata(result, "page")
-                if metadata:
-                    all_results.append(metadata)
-            
-            # Process database results
-            db_results = database_results.get("results", [])
-            for result in db_results:
-                metadata = self._extract_metadata(result, "database")
+            for result in results:
+                object_type = result.get("object") or kind
+                if object_type not in ("page", "database"):
+                    continue
+                metadata = self._extract_metadata(result, object_type)
                 if metadata:
                     all_results.append(metadata)
             
-            # Sort by last_edited_time (most recent first)
-            all_results.sort(
-                key=lambda x: x.get("last_edited", datetime.min),
-                reverse=True
-            )
-            
-            # Limit results
-            limited_results = all_results[:max_results]
+            # Most recently edited first, limited to max_results
+            limited_results = heapq.nlargest(max_results, all_results, key=itemgetter("last_edited"))
             
             logger.info(f"Found {len(limited_results)} matching objects (pages and databases)")
-            return limited_results
-            
+            self._search_cache[cache_key] = limited_results
+            return [dict(r) for r in limited_results]
+        
         except Exception as e:
             logger.error(f"Search failed for query '{query}': {e}")
-            if "401" in str(e) or "unauthorized" in str(e).lower():
+            status = api_error_status(e)
+            if status == 401:
                 raise ConnectionError(f"Notion API authentication failed: {e}")
-            elif "403" in str(e) or "forbidden" in str(e).lower():
+            elif status == 403:
                 raise ConnectionError(f"Notion API access forbidden: {e}")
             else:
                 raise Exception(f"Search operation failed: {e}")
     
+    async def _paginated_search(self, query: str, object_type: Optional[str],
+                                needed: int) -> List[Dict[str, Any]]:
+        """Search Notion, following cursors until enough results are found.
+        
+        Full pages of 100 are requested so the most recently edited matches
+        can be picked from a wider pool than ``needed``; further pages are
+        only fetched while fewer than ``needed`` results have been collected.
+        
+        Args:
+            query: Search query string
+            object_type: Type of object to search for ('page' or 'database'),
+                or None for both
+            needed: Number of results the caller wants
+        
+        Returns:
+            Raw search results, at least ``needed`` of them if Notion has that many
+        """
+        results: List[Dict[str, Any]] = []
+        start_cursor = None
+        while True:
+            params: Dict[str, Any] = {
+                "query": query,
+                "page_size": 100  # Get more results to filter and sort
+            }
+            if object_type:
+                params["filter"] = {
+                    "property": "object",
+                    "value": object_type
+                }
+            if start_cursor:
+                params["start_cursor"] = start_cursor
+            
+            response = await self.client.search(**params)
+            results.extend(response.get("results", []))
+            start_cursor = response.get("next_cursor")
+            if len(results) >= needed or not response.get("has_more") or not start_cursor:
+                return results
+    
     def _extract_metadata(self, result: Dict[str, Any], object_type: str) -> Optional[Dict[str, Any]]:
         """Extract metadata from a Notion search result.
         
         Args:
             result: Search result from Notion API
             object_type: Type of object ('page' or 'database')
-            
+        
         Returns:
             Metadata dictionary or None if extraction fails
         """
@@ -324,7 +394,7 @@ class NotionSearcher:
                 return None
             
             # Extract title based on object type
-            title = self._extract_title_for_search(result, object_type)
+            title = self._extract_title(result, object_type)
             
             # Extract timestamps
             created_time = self._parse_datetime(result.get("created_time"))
@@ -343,45 +413,7 @@ class NotionSearcher:
             }
             
             return metadata
-            
+        
         except Exception as e:
             logger.warning(f"Failed to extract metadata from {object_type} result: {e}")
             return None
-    
-    def _extract_title_for_search(self, result: Dict[str, Any], object_type: str) -> str:
-        """Extract title from search result based on object type.
-        
-        Args:
-            result: Search result from Notion API
-            object_type: Type of object ('page' or 'database')
-            
-        Returns:
-            Extracted title or fallback
-        """
-        try:
-            if object_type == "page":
-                # For pages, look in properties for title
-                properties = result.get("properties", {})
-                for prop_name, prop_data in properties.items():
-                    if prop_data.get("type") == "title":
-                        title_rich_text = prop_data.get("title", [])
-                        title = self.parser._extract_rich_text(title_rich_text)
-                        if title:
-                            return title
-                            
-            elif object_type == "database":
-                # For databases, title is in the title array
-                title_array = result.get("title", [])
-                if title_array:
-                    title = self.parser._extract_rich_text(title_array)
-                    if title:
-                        return title
-            
-            # Fallback to object ID if no title found
-            object_id = result.get("id", "unknown")
-            return f"Untitled {object_type.title()} ({object_id})"
-            
-        except Exception as e:
-            logger.warning(f"Failed to extract title for {object_type}: {e}")
-            object_id = result.get("id", "unknown")
-            return f"Untitled {object_type.title()} ({object_id})"
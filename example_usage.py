@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Example usage of the Notion Context Service client helper."""
 
+import asyncio
 import sys
 import os
 import logging
@@ -9,14 +10,14 @@ import logging
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 # Import with absolute paths
-from app.notion.client import create_notion_client, get_notion_client
+from app.notion.client import create_notion_client, get_notion_client, close_notion_client
 from app.config import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def main():
+async def main():
     """Demonstrate how to use the Notion client helper functions."""
     
     print("=== Notion Context Service - Client Helper Example ===\n")
@@ -35,22 +36,22 @@ def main():
     try:
         # Method 1: Using create_notion_client()
         print("Creating Notion client using create_notion_client()...")
-        client1 = create_notion_client()
+        client1 = await create_notion_client()
         print("✅ Client created successfully")
         
         # Method 2: Using get_notion_client() (alias)
-        print("\nCreating Notion client using get_notion_client()...")
-        client2 = get_notion_client()
-        print("✅ Client created successfully")
+        print("\nGetting Notion client using get_notion_client()...")
+        client2 = await get_notion_client()
+        print(f"✅ Same shared client returned: {client2 is client1}")
         
         # Test the connection
         print("\nTesting connection to Notion API...")
-        user_info = client1.client.users.me()
+        user_info = await client1.client.users.me()
         print(f"✅ Connected successfully! User: {user_info.get('name', 'Unknown')}")
         
         # Example: Search for pages
         print("\nSearching for pages...")
-        search_results = client1.search_pages("test")
+        search_results = await client1.search_pages("test")
         print(f"✅ Found {len(search_results.get('results', []))} pages")
         
         print("\n🎉 All tests passed! Your Notion integration is working correctly.")
@@ -61,6 +62,8 @@ def main():
         print("1. Make sure your NOTION_API_KEY is correct")
         print("2. Ensure your integration has access to the pages you're trying to access")
         print("3. Check that your integration token starts with 'secret_'")
+    finally:
+        await close_notion_client()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())